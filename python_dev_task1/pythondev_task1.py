@@ -1,19 +1,601 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify, request
 import pandas as pd
+import numpy as np
+import gzip
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # the columnar cache is optional
+    pa = None
 
 app = Flask(__name__)
 
-# --- Load CSV data ---
-df = pd.read_csv('indeed-job-listings-information.csv')
+DATA_FILE = Path('indeed-job-listings-information.csv')
+CACHE_FILE = DATA_FILE.with_suffix('.feather')
+DATE_COLUMN = 'date_posted_parsed'
+# Set JOBS_COMPACT_DTYPES=0 to keep the plain pandas dtypes
+COMPACT_DTYPES = os.environ.get('JOBS_COMPACT_DTYPES', '1') != '0'
+CATEGORY_RATIO = 0.5   # string columns with fewer unique values than this share become categorical
 
 # --- Drop unnecessary columns ---
 columns_to_exclude = ['date_posted_parsed', 'domain', 'is_expired', 'timestamp']
-response_columns = [col for col in df.columns if col not in columns_to_exclude]
+# The posting date is kept (typed) for the /jobs date index, the rest is never loaded
+unused_columns = [col for col in columns_to_exclude if col != DATE_COLUMN]
+
+
+# --- Load data (CSV once, then a memory-mapped columnar cache) ---
+def source_signature(csv_path, compact=COMPACT_DTYPES):
+    """Identify a CSV version by size and modification time, plus the dtype mode"""
+    stat = os.stat(csv_path)
+    return {
+        b'source_size': str(stat.st_size).encode(),
+        b'source_mtime_ns': str(stat.st_mtime_ns).encode(),
+        b'compact_dtypes': b'1' if compact else b'0',
+    }
+
+
+def compact_dtypes(frame):
+    """Return a copy of frame with categoricals, Arrow strings and downcast numerics"""
+    string_dtype = pd.StringDtype('pyarrow') if pa is not None else pd.StringDtype()
+    columns = {}
+    for col in frame.columns:
+        series = frame[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_datetime64_any_dtype(series) \
+                or pd.api.types.is_bool_dtype(series):
+            columns[col] = series
+        elif pd.api.types.is_integer_dtype(series):
+            columns[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            # Only downcast when it is lossless, otherwise e.g. 4.1 would serialize as 4.099999904
+            downcast = pd.to_numeric(series, downcast='float')
+            lossless = np.array_equal(downcast.to_numpy(np.float64), series.to_numpy(np.float64), equal_nan=True)
+            columns[col] = downcast if lossless else series
+        elif series.nunique(dropna=True) < len(series) * CATEGORY_RATIO:
+            columns[col] = series.astype('category')
+        else:
+            columns[col] = series.astype(string_dtype)
+    return pd.DataFrame(columns)
+
+
+def memory_report(before, after):
+    """Per-column memory of two versions of the frame, in bytes, with a total row"""
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str),
+        'bytes_before': before.memory_usage(deep=True, index=False),
+        'bytes_after': after.memory_usage(deep=True, index=False),
+    })
+    report.loc['TOTAL'] = ['', '', report['bytes_before'].sum(), report['bytes_after'].sum()]
+    report['ratio'] = (report['bytes_before'] / report['bytes_after']).round(1)
+    return report
+
+
+def read_csv_source(csv_path, compact=COMPACT_DTYPES):
+    """Parse the CSV, skipping unused columns and typing the posting date"""
+    frame = pd.read_csv(csv_path, usecols=lambda col: col not in unused_columns)
+    if DATE_COLUMN in frame.columns:
+        frame[DATE_COLUMN] = pd.to_datetime(frame[DATE_COLUMN], utc=True, errors='coerce')
+    return compact_dtypes(frame) if compact else frame
+
+
+def write_cache(frame, cache_path, signature):
+    """Write an uncompressed Feather (Arrow IPC) file so readers can memory-map it"""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **signature})
+    # Write beside the target and rename, so concurrent workers never read a partial file
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, cache_path)
+
+
+def read_cache(cache_path, signature):
+    """Memory-map the cache and return it as a DataFrame, or None if it is missing or stale"""
+    try:
+        source = pa.memory_map(str(cache_path), 'r')
+        reader = pa.ipc.open_file(source)
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+    metadata = reader.schema.metadata or {}
+    if any(metadata.get(key) != value for key, value in signature.items()):
+        return None
+
+    # Arrow-backed strings keep pointing into the mapped file, so workers share those pages
+    string_types = {pa.string(): pd.StringDtype('pyarrow'), pa.large_string(): pd.StringDtype('pyarrow')}
+    return reader.read_all().to_pandas(types_mapper=string_types.get)
+
+
+def load_dataset(csv_path=DATA_FILE, cache_path=CACHE_FILE, compact=COMPACT_DTYPES):
+    """Load the listings from the columnar cache, rebuilding it when the CSV has changed"""
+    if pa is None:
+        return read_csv_source(csv_path, compact)
+
+    signature = source_signature(csv_path, compact)
+    frame = read_cache(cache_path, signature)
+    if frame is None:
+        write_cache(read_csv_source(csv_path, compact), cache_path, signature)
+        frame = read_cache(cache_path, signature)
+    return frame
+
+# --- Streaming settings ---
+STREAM_BATCH_SIZE = 500   # rows serialized per chunk
+MAX_LIMIT = 10000         # largest page a client may ask for
+GZIP_LEVEL = 6
+
+
+# --- Precomputed full payload ---
+def build_payload(frame, columns):
+    """Serialize the projected dataset once and keep the bytes, a gzip copy and an ETag"""
+    body = frame[columns].to_json(orient='records', force_ascii=False).encode('utf-8')
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    return {
+        'body': body,
+        'gzip': gzip.compress(body, compresslevel=GZIP_LEVEL),
+        'etag': etag,
+    }
+
+
+def not_modified(etag):
+    """True if the client already holds the representation tagged etag"""
+    return etag in request.if_none_match
+
+
+def serve_payload(cached):
+    """Serve the precomputed payload, honoring If-None-Match and Accept-Encoding"""
+    # 'gzip;q=0' still lists gzip but forbids it, so go by the quality value
+    use_gzip = request.accept_encodings['gzip'] > 0
+    # Each encoding is a separate representation and needs its own strong ETag
+    etag = cached['etag'] + ('-gz' if use_gzip else '')
+
+    if not_modified(etag):
+        response = Response(status=304)
+    else:
+        response = Response(cached['gzip'] if use_gzip else cached['body'],
+                            mimetype='application/json')
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def query_etag(args, dataset_etag):
+    """ETag for a paginated/projected view: dataset hash plus the normalized query"""
+    query = '&'.join(f'{key}={args[key]}' for key in sorted(args))
+    return dataset_etag + '-' + hashlib.sha256(query.encode('utf-8')).hexdigest()[:16]
+
+
+# --- Query indexes ---
+FILTER_COLUMNS = {'company': 'company_name', 'location': 'location', 'job_type': 'job_type'}
+SEARCH_COLUMNS = ['job_title', 'description_text']
+SORT_COLUMNS = {'date': DATE_COLUMN, 'company': 'company_name', 'title': 'job_title',
+                'location': 'location', 'rating': 'company_rating'}
+DEFAULT_JOBS_LIMIT = 100
+TOKEN_PATTERN = r'\w+'
+
+EMPTY = np.empty(0, dtype=np.int64)
+
+
+def build_categorical_index(series):
+    """Map each lower-cased value to the sorted array of row positions holding it"""
+    keys = series.astype('string').str.strip().str.lower()
+    return {key: positions.astype(np.int64) for key, positions in keys.groupby(keys, sort=False).indices.items()}
+
+
+def build_inverted_index(frame, columns):
+    """Map each lower-cased word in the given text columns to the sorted rows containing it"""
+    text = frame[columns[0]].astype('string').fillna('')
+    for col in columns[1:]:
+        text = text + ' ' + frame[col].astype('string').fillna('')
+
+    tokens = text.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    pairs = pd.DataFrame({'row': tokens.index.to_numpy(np.int64), 'token': tokens.to_numpy()})
+    pairs = pairs.drop_duplicates()
+    rows = pairs['row'].to_numpy()
+    return {token: rows[positions] for token, positions in pairs.groupby('token', sort=False).indices.items()}
+
+
+def build_date_index(series):
+    """Return (sorted timestamps as int64 ns, row positions in that order), NaT rows left out"""
+    dates = pd.to_datetime(series, utc=True, errors='coerce')
+    valid = dates.notna().to_numpy()
+    values = dates.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    positions = np.flatnonzero(valid)
+    order = np.argsort(values[positions], kind='stable')
+    return values[positions][order], positions[order]
+
+
+def build_sort_rank(series):
+    """Precomputed rank of every row for one sort key, NaN where the value is missing"""
+    if series.name == DATE_COLUMN:
+        series = pd.to_datetime(series, utc=True, errors='coerce')
+    elif not pd.api.types.is_numeric_dtype(series):
+        series = series.astype('string').str.lower()
+    codes, _ = pd.factorize(series, sort=True)
+    ranks = codes.astype(np.float64)
+    ranks[codes < 0] = np.nan
+    return ranks
+
+
+def build_indexes(frame):
+    """Build all lookup structures for /jobs once, when the data is loaded"""
+    indexes = {'categories': {}, 'text': {}, 'dates': (np.empty(0, np.int64), EMPTY), 'ranks': {}}
+    for param, col in FILTER_COLUMNS.items():
+        if col in frame.columns:
+            indexes['categories'][param] = build_categorical_index(frame[col])
+    text_columns = [col for col in SEARCH_COLUMNS if col in frame.columns]
+    if text_columns:
+        indexes['text'] = build_inverted_index(frame, text_columns)
+    if DATE_COLUMN in frame.columns:
+        indexes['dates'] = build_date_index(frame[DATE_COLUMN])
+    for key, col in SORT_COLUMNS.items():
+        if col in frame.columns:
+            indexes['ranks'][key] = build_sort_rank(frame[col])
+    return indexes
+
+
+# --- Facet counts ---
+FACET_COLUMNS = {'company': 'company_name', 'location': 'location', 'job_type': 'job_type'}
+DEFAULT_FACET_TOP = 10
+MAX_FACET_TOP = 1000
+NS_PER_DAY = 86_400 * 10**9
+
+
+def build_facet(codes, labels):
+    """Precompute counts per value plus the value order by descending count"""
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    return {'codes': codes, 'labels': labels, 'counts': counts,
+            'ranking': np.argsort(-counts, kind='stable')}
+
+
+def build_facets(frame):
+    """Integer codes and full counts for every facet, computed once per load"""
+    facets = {}
+    for param, col in FACET_COLUMNS.items():
+        if col in frame.columns:
+            codes, labels = pd.factorize(frame[col])
+            facets[param] = build_facet(codes.astype(np.int32), [str(label) for label in labels])
+
+    if DATE_COLUMN in frame.columns:
+        dates = pd.to_datetime(frame[DATE_COLUMN], utc=True, errors='coerce')
+        valid = dates.notna().to_numpy()
+        days = np.full(len(frame), -1, dtype=np.int64)
+        days[valid] = dates[valid].to_numpy(dtype='datetime64[ns]').astype(np.int64) // NS_PER_DAY
+        first_day = days[valid].min() if valid.any() else 0
+        codes = np.where(valid, days - first_day, -1).astype(np.int32)
+        span = int(codes.max()) + 1 if valid.any() else 0
+        labels = [str(np.datetime64(int(first_day) + day, 'D')) for day in range(span)]
+        facets['posted_per_day'] = build_facet(codes, labels)
+    return facets
+
+
+def facet_counts(facet, positions, total, top):
+    """Counts for the matched rows; the full precomputed counts when nothing is filtered"""
+    if len(positions) == total:
+        counts, ranking = facet['counts'], facet['ranking']
+    else:
+        codes = facet['codes'][positions]
+        counts = np.bincount(codes[codes >= 0], minlength=len(facet['labels']))
+        ranking = np.argsort(-counts, kind='stable')
+
+    if top is None:  # histograms come back in label (date) order, zero days dropped
+        ranking = np.flatnonzero(counts)
+    else:
+        ranking = ranking[:top]
+    return [{"value": facet['labels'][i], "count": int(counts[i])} for i in ranking if counts[i]]
+
+
+# --- Dataset snapshot and hot reload ---
+RELOAD_INTERVAL = float(os.environ.get('JOBS_RELOAD_INTERVAL', 30))  # seconds, 0 disables
+
+
+def build_dataset(csv_path=DATA_FILE, cache_path=CACHE_FILE):
+    """Load the listings and everything derived from them into one snapshot"""
+    signature = source_signature(csv_path)
+    frame = load_dataset(csv_path, cache_path)
+    columns = [col for col in frame.columns if col not in columns_to_exclude]
+    return {
+        'df': frame,
+        'columns': columns,
+        'payload': build_payload(frame, columns),
+        'indexes': build_indexes(frame),
+        'facets': build_facets(frame),
+        'signature': signature,
+    }
+
+
+dataset = build_dataset()
+_reload_lock = threading.Lock()
+_watcher = {'pid': None}
+
+
+def reload_if_changed(csv_path=DATA_FILE, cache_path=CACHE_FILE):
+    """Rebuild the snapshot if the CSV changed, then swap it in; returns True if it did"""
+    global dataset
+    with _reload_lock:
+        if source_signature(csv_path) == dataset['signature']:
+            return False
+        fresh = build_dataset(csv_path, cache_path)
+        # A single reference swap: a request sees the old snapshot or the new one, never a mix
+        dataset = fresh
+    return True
+
+
+def watch_source(interval, csv_path=DATA_FILE):
+    """Poll the CSV and reload it off the request path once it has stopped changing"""
+    last_seen = dataset['signature']
+    while True:
+        time.sleep(interval)
+        try:
+            signature = source_signature(csv_path)
+            # Wait one more interval if the file is still being written
+            if signature != last_seen:
+                last_seen = signature
+                continue
+            if reload_if_changed(csv_path):
+                app.logger.info("Reloaded %s", csv_path)
+        except Exception:
+            app.logger.exception("Reloading %s failed, keeping the current data", csv_path)
+
+
+@app.before_request
+def ensure_watcher():
+    """Start the reload watcher once per process, so it also runs in forked workers"""
+    if RELOAD_INTERVAL > 0 and _watcher['pid'] != os.getpid():
+        _watcher['pid'] = os.getpid()
+        threading.Thread(target=watch_source, args=(RELOAD_INTERVAL,), daemon=True).start()
+
+
+def parse_timestamp(value):
+    """Parse a query-string date into int64 UTC nanoseconds"""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    return timestamp.value
+
+
+def intersect_all(candidates):
+    """Intersect sorted position arrays by binary-searching the smallest one into the others
+
+    Costs O(k log n) for a k-element smallest list, however long the other lists are.
+    """
+    candidates = sorted(candidates, key=len)
+    result = candidates[0]
+    for other in candidates[1:]:
+        if not len(result) or not len(other):
+            return result[:0]
+        hits = np.searchsorted(other, result).clip(max=len(other) - 1)
+        result = result[other[hits] == result]
+    return result
+
+
+def query_positions(idx, args, total):
+    """Resolve /jobs filters to the sorted row positions that match all of them"""
+    candidates = []
+
+    for param, index in idx['categories'].items():
+        values = [value.strip().lower() for value in args.getlist(param) if value.strip()]
+        if values:
+            matches = [index.get(value, EMPTY) for value in values]
+            candidates.append(np.unique(np.concatenate(matches)))
+
+    for token in re.findall(TOKEN_PATTERN, args.get('q', '').lower()):
+        candidates.append(idx['text'].get(token, EMPTY))
+
+    posted_after, posted_before = args.get('posted_after'), args.get('posted_before')
+    if posted_after or posted_before:
+        values, positions = idx['dates']
+        lo = np.searchsorted(values, parse_timestamp(posted_after), 'left') if posted_after else 0
+        hi = np.searchsorted(values, parse_timestamp(posted_before), 'left') if posted_before else len(values)
+        candidates.append(np.sort(positions[lo:hi]))
+
+    if not candidates:
+        return np.arange(total, dtype=np.int64)
+    return intersect_all(candidates)
+
+
+def sort_positions(idx, positions, sort, order):
+    """Order matched rows by a precomputed rank; costs O(k log k) for k matches"""
+    if sort not in idx['ranks']:
+        raise ValueError(f"Cannot sort by '{sort}', use one of: {', '.join(idx['ranks'])}")
+    ranks = idx['ranks'][sort][positions]
+    # argsort puts NaN last either way, so missing values trail in both directions
+    order_by = np.argsort(-ranks if order == 'desc' else ranks, kind='stable')
+    return positions[order_by]
+
+
+def parse_pagination(args):
+    """Read limit/offset from the query string, return (limit, offset) or raise ValueError"""
+    offset = int(args.get('offset', 0))
+    limit = args.get('limit')
+    limit = int(limit) if limit is not None else None
+
+    if offset < 0:
+        raise ValueError("offset must be >= 0")
+    if limit is not None and not 0 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 0 and {MAX_LIMIT}")
+    return limit, offset
+
+
+def parse_fields(args, response_columns):
+    """Return the requested column projection, or all response columns"""
+    fields = args.get('fields')
+    if not fields:
+        return response_columns
+
+    selected = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in selected if field not in response_columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+
+def iter_batches(frame, columns, start, stop, batch_size=STREAM_BATCH_SIZE):
+    """Yield row slices of the projected frame, batch_size rows at a time"""
+    for batch_start in range(start, stop, batch_size):
+        batch_stop = min(batch_start + batch_size, stop)
+        yield frame.iloc[batch_start:batch_stop][columns]
+
+
+def generate_json(frame, columns, start, stop):
+    """Stream rows as a single JSON array, one batch per chunk"""
+    yield '['
+    first = True
+    for batch in iter_batches(frame, columns, start, stop):
+        records = batch.to_json(orient='records', force_ascii=False)[1:-1]
+        if not records:
+            continue
+        yield records if first else ',' + records
+        first = False
+    yield ']'
+
+
+def generate_ndjson(frame, columns, start, stop):
+    """Stream rows as newline-delimited JSON, one batch per chunk"""
+    for batch in iter_batches(frame, columns, start, stop):
+        if len(batch):
+            yield batch.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n'
+
 
 @app.route('/', methods=['GET'])
 def show_dataset():
-    data = df[response_columns].to_dict(orient='records')
-    return jsonify(data)
+    current = dataset  # one snapshot for the whole request, even if a reload swaps it
+    df = current['df']
+
+    # The common "give me everything" request is answered from the cached bytes
+    if not request.args:
+        return serve_payload(current['payload'])
+
+    etag = query_etag(request.args, current['payload']['etag'])
+    if not_modified(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    try:
+        limit, offset = parse_pagination(request.args)
+        columns = parse_fields(request.args, current['columns'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    total = len(df)
+    start = min(offset, total)
+    stop = total if limit is None else min(start + limit, total)
+
+    if request.args.get('format') == 'ndjson':
+        body, mimetype = generate_ndjson(df, columns, start, stop), 'application/x-ndjson'
+    else:
+        body, mimetype = generate_json(df, columns, start, stop), 'application/json'
+
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers['X-Total-Count'] = str(total)
+    if stop < total:
+        response.headers['X-Next-Offset'] = str(stop)
+    return response
+
+
+@app.route('/jobs', methods=['GET'])
+def search_jobs():
+    """Filter, search and sort the listings using the precomputed indexes
+
+    Query parameters:
+        company, location, job_type   exact match, case-insensitive, repeatable
+        q                             words that must all appear in title/description
+        posted_after, posted_before   date range, after inclusive / before exclusive
+        sort, order                   one of SORT_COLUMNS, 'asc' (default) or 'desc'
+        limit, offset, fields         paging and projection, as for /
+    """
+    current = dataset
+    df, indexes = current['df'], current['indexes']
+    try:
+        limit, offset = parse_pagination(request.args)
+        columns = parse_fields(request.args, current['columns'])
+        positions = query_positions(indexes, request.args, len(df))
+        sort = request.args.get('sort')
+        if sort:
+            positions = sort_positions(indexes, positions, sort, request.args.get('order', 'asc'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if limit is None:
+        limit = DEFAULT_JOBS_LIMIT
+    page = positions[offset:offset + limit]
+    results = df.iloc[page][columns].to_json(orient='records', force_ascii=False)
+
+    body = f'{{"total":{len(positions)},"offset":{offset},"limit":{limit},"results":{results}}}'
+    return Response(body, mimetype='application/json')
+
+
+@app.route('/jobs/facets', methods=['GET'])
+def job_facets():
+    """Counts by company, location and job type (top N) plus a per-day posting histogram
+
+    Accepts the /jobs filter parameters, plus:
+        top      how many values per facet to return (default 10)
+        facets   comma-separated subset of facets to compute
+    """
+    current = dataset
+    facets, total = current['facets'], len(current['df'])
+    try:
+        top = int(request.args.get('top', DEFAULT_FACET_TOP))
+        if not 1 <= top <= MAX_FACET_TOP:
+            raise ValueError(f"top must be between 1 and {MAX_FACET_TOP}")
+        wanted = request.args.get('facets')
+        names = [name.strip() for name in wanted.split(',')] if wanted else list(facets)
+        unknown = [name for name in names if name not in facets]
+        if unknown:
+            raise ValueError(f"Unknown facets: {', '.join(unknown)}")
+        positions = query_positions(current['indexes'], request.args, total)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    result = {name: facet_counts(facets[name], positions, total,
+                                 None if name == 'posted_per_day' else top)
+              for name in names}
+    return jsonify({"total": int(len(positions)), "facets": result})
+
+
+def benchmark_load(csv_path=DATA_FILE, cache_path=CACHE_FILE, repeat=5):
+    """Time the CSV parse against a warm columnar-cache load"""
+    def best_of(load):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            load()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    csv_time = best_of(lambda: read_csv_source(csv_path))
+    print(f"CSV parse:   {csv_time * 1000:9.1f} ms")
+    if pa is None:
+        print("pyarrow is not installed, columnar cache unavailable")
+        return
+
+    load_dataset(csv_path, cache_path)  # make sure the cache exists
+    cache_time = best_of(lambda: load_dataset(csv_path, cache_path))
+    print(f"Cache load:  {cache_time * 1000:9.1f} ms  ({csv_time / cache_time:.0f}x faster)")
+
+
+def print_memory_report(csv_path=DATA_FILE):
+    """Show how much memory the compact dtypes save, column by column"""
+    plain = read_csv_source(csv_path, compact=False)
+    report = memory_report(plain, compact_dtypes(plain))
+    print(report.to_string())
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    if sys.argv[1:] == ['benchmark']:
+        benchmark_load()
+    elif sys.argv[1:] == ['memory']:
+        print_memory_report()
+    else:
+        app.run(debug=True)
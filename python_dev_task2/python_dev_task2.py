@@ -1,9 +1,914 @@
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
+from PIL import Image, UnidentifiedImageError
+from PIL.PngImagePlugin import PngInfo
 import os
+import sys
+import argparse
+import hashlib
+import io
+import json
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
+from collections import OrderedDict
 import threading
+import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox
+    from PIL import ImageTk
+except ImportError:  # headless installs without Tk can still use the command line
+    tk = None
+
+POLL_INTERVAL_MS = 100  # how often the UI drains the progress queue
+OUTPUT_FORMATS = ["Same as original", "JPEG", "PNG", "WEBP", "BMP"]
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tif', '.tiff', '.webp'}
+PREVIEW_SIZE = (300, 200)
+PREVIEW_CACHE_BYTES = 64 * 1024 * 1024   # decoded thumbnails kept in memory
+PREVIEW_PREFETCH = 2                     # neighbours on each side of the selection to prepare
+PREVIEW_POLL_MS = 20
+# Large downscales first shrink by an integer factor (JPEG: inside the decoder),
+# but never below REDUCING_GAP times the target, then LANCZOS does the rest
+REDUCING_GAP = 2.0
+MANIFEST_NAME = ".processed_manifest.db"
+MANIFEST_SCHEMA = 3   # the manifest is only a cache: an older layout is dropped and rebuilt
+# Bump when the processing itself changes, so existing outputs are regenerated
+PIPELINE_VERSION = 1
+DEFAULT_MEMORY_BUDGET_MB = 512   # decoded frames held at once by the streaming pipeline
+BENCHMARK_SIZES = [(640, 480), (1920, 1080), (4000, 3000), (6000, 4000)]
+BENCHMARK_FORMATS = ['JPEG', 'PNG', 'WEBP']
+
+
+def make_settings(output_format="Same as original", quality=85, width=800, height=600, keep_aspect=True,
+                  variant_widths=None, variant_formats=None):
+    """Build the settings dict used by convert_image, with the GUI's defaults
+
+    Giving variant_widths switches to variant-set mode: every width is written
+    in every one of variant_formats, and format/width/height are not used.
+    """
+    settings = {
+        'format': output_format,
+        'quality': quality,
+        'width': width,
+        'height': height,
+        'keep_aspect': keep_aspect,
+    }
+    if variant_widths:
+        settings['variant_widths'] = sorted({int(width) for width in variant_widths}, reverse=True)
+        settings['variant_formats'] = [fmt.upper() for fmt in (variant_formats or ["JPEG"])]
+    return settings
+
+
+def parse_list(value, convert=str):
+    """Split a comma-separated option like '1600,800,320' into a list"""
+    return [convert(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def iter_image_files(paths, recursive=True, exclude=None):
+    """Yield (image file, folder relative to its input root) lazily, one directory entry at a time
+
+    Uses os.scandir directly, so even a directory with millions of files is
+    never listed into memory up front. The exclude folder (normally the output
+    folder) is never descended into, even when it sits inside an input tree.
+    """
+    excluded = os.path.realpath(exclude) if exclude is not None else None
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path, ''
+            continue
+
+        directories = [(path, '')]
+        while directories:
+            directory, relative_dir = directories.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and os.path.realpath(entry.path) != excluded:
+                            directories.append((entry.path, os.path.join(relative_dir, entry.name)))
+                    elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                        yield entry.path, relative_dir
+
+
+def split_image_item(item, output_path):
+    """iter_convert item -> (image path, its output folder)
+
+    An item is a plain path, written straight into output_path, or a
+    (path, relative folder) pair from iter_image_files, written into that
+    folder under output_path so same-named files in different folders don't collide.
+    """
+    if isinstance(item, tuple):
+        image_path, relative_dir = item
+        return image_path, Path(output_path) / relative_dir
+    return item, Path(output_path)
+
+
+def fit_size(size, target_width, target_height):
+    """Largest size with the aspect ratio of size that fits in the target box"""
+    original_width, original_height = size
+    ratio = min(target_width / original_width, target_height / original_height)
+    return int(original_width * ratio), int(original_height * ratio)
+
+
+def resize_with_aspect(image, target_width, target_height):
+    """Resize image while maintaining aspect ratio"""
+    new_size = fit_size(image.size, target_width, target_height)
+    return image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+def get_extension(format_name):
+    """Get file extension for given format"""
+    extensions = {
+        'JPEG': '.jpg',
+        'JPG': '.jpg',
+        'PNG': '.png',
+        'WEBP': '.webp',
+        'BMP': '.bmp',
+        'GIF': '.gif',
+        'TIFF': '.tiff'
+    }
+    return extensions.get(format_name.upper(), '.jpg')
+
+
+def save_options(output_format, quality):
+    """Encoder keyword arguments for a format"""
+    save_kwargs = {}
+    if output_format.upper() == 'JPEG':
+        save_kwargs['quality'] = quality
+        save_kwargs['optimize'] = True
+    elif output_format.upper() == 'PNG':
+        save_kwargs['optimize'] = True
+    elif output_format.upper() == 'WEBP':
+        save_kwargs['quality'] = quality
+    return save_kwargs
+
+
+@contextmanager
+def timed(timings, stage):
+    """Add the time spent in the block to timings[stage]; a no-op when timings is None"""
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def encode_image(img, output_format, quality):
+    """Encode to bytes in memory, so encoding and writing can be timed (and run) apart"""
+    buffer = io.BytesIO()
+    img.save(buffer, format=output_format, **save_options(output_format, quality))
+    return buffer.getvalue()
+
+
+def write_output(output_file, data):
+    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'wb') as f:
+        f.write(data)
+
+
+class MemoryBudget:
+    """Caps the estimated bytes of decoded frames alive at once, across threads"""
+
+    def __init__(self, limit_bytes):
+        self.limit = limit_bytes
+        self.used = 0
+        self.condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, nbytes):
+        # A frame bigger than the whole budget still gets processed, just on its own
+        nbytes = min(nbytes, self.limit)
+        with self.condition:
+            while self.used + nbytes > self.limit:
+                self.condition.wait()
+            self.used += nbytes
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.used -= nbytes
+                self.condition.notify_all()
+
+
+def reserve(budget, nbytes):
+    """budget.reserve(nbytes), or a no-op when there is no budget"""
+    return budget.reserve(nbytes) if budget is not None else nullcontext()
+
+
+def decoded_bytes(img):
+    """Memory a decoded frame of img needs, known from the header (after any draft)"""
+    return img.width * img.height * len(img.getbands())
+
+
+def output_format_for(settings, source_format):
+    """Format of a single (non-variant) output"""
+    if settings['format'] == "Same as original":
+        return source_format or 'JPEG'
+    return settings['format']
+
+
+def output_files_for(image_path, output_path, settings, source_format=None):
+    """Files a conversion of image_path writes: <stem>_processed<ext>, or <stem>_<width>w<ext> per variant"""
+    original_name = Path(image_path).stem
+    if settings.get('variant_widths'):
+        return [Path(output_path) / f"{original_name}_{width}w{get_extension(output_format)}"
+                for width in sorted(set(settings['variant_widths']), reverse=True)
+                for output_format in settings['variant_formats']]
+
+    extension = get_extension(output_format_for(settings, source_format))
+    return [Path(output_path) / f"{original_name}_processed{extension}"]
+
+
+def planned_outputs(image_path, output_path, settings):
+    """output_files_for() before converting; reads only the header, and only if the name depends on it"""
+    source_format = None
+    if not settings.get('variant_widths') and settings['format'] == "Same as original":
+        with Image.open(image_path) as img:
+            source_format = img.format
+    return output_files_for(image_path, output_path, settings, source_format)
+
+
+def render_image(source, image_path, output_path, settings, timings=None, budget=None):
+    """Decode, transform and encode one image without writing it, return [(output_file, bytes)]
+
+    source is the image path or a file object with its contents. With a
+    MemoryBudget, decoding waits until the budget has room for the frame and
+    its resized copy.
+    """
+    if settings.get('variant_widths'):
+        return render_variants(source, image_path, output_path, settings['variant_widths'],
+                               settings['variant_formats'], settings['quality'], timings, budget)
+
+    with Image.open(source) as img:
+        source_format = img.format
+
+        width, height = settings['width'], settings['height']
+        new_size = None
+        if width != img.width or height != img.height:
+            new_size = fit_size(img.size, width, height) if settings['keep_aspect'] else (width, height)
+            # JPEG only: decode at 1/2, 1/4 or 1/8 scale instead of full resolution
+            img.draft(img.mode, (int(new_size[0] * REDUCING_GAP), int(new_size[1] * REDUCING_GAP)))
+
+        with reserve(budget, decoded_bytes(img) * 2):
+            with timed(timings, 'decode'):
+                img.load()
+
+            # Convert to RGB if necessary (for JPEG)
+            if img.mode in ('RGBA', 'LA', 'P'):
+                with timed(timings, 'convert'):
+                    img = img.convert('RGB')
+
+            # Resize image (sizes come from the original dimensions, not the draft ones)
+            if new_size is not None:
+                with timed(timings, 'resize'):
+                    img = img.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+            # Determine output format and filename
+            output_format = output_format_for(settings, source_format)
+            output_file = output_files_for(image_path, output_path, settings, source_format)[0]
+
+            # Encode with appropriate options
+            with timed(timings, 'encode'):
+                data = encode_image(img, output_format, settings['quality'])
+        return [(output_file, data)]
+
+
+def render_variants(source, image_path, output_path, widths, formats, quality=85, timings=None, budget=None):
+    """Decode once and encode each width in each format as <stem>_<width>w<ext>
+
+    Sizes are produced largest first, each one downscaled from the previous
+    one, so the full-size image is only resampled once. Widths larger than the
+    source are written at the source size rather than upscaled.
+    """
+    widths = sorted(set(widths), reverse=True)
+    output_files = iter(output_files_for(image_path, output_path,
+                                         {'variant_widths': widths, 'variant_formats': formats}))
+    outputs = []
+
+    with Image.open(source) as img:
+        original_width, original_height = img.size
+
+        def size_for(width):
+            width = min(width, original_width)
+            return width, max(1, round(original_height * width / original_width))
+
+        largest = size_for(widths[0])
+        img.draft(img.mode, (int(largest[0] * REDUCING_GAP), int(largest[1] * REDUCING_GAP)))
+
+        with reserve(budget, decoded_bytes(img) * 2):
+            with timed(timings, 'decode'):
+                img.load()
+            current = img
+            if img.mode in ('RGBA', 'LA', 'P'):
+                with timed(timings, 'convert'):
+                    current = img.convert('RGB')
+
+            for width in widths:
+                size = size_for(width)
+                if current.size != size:
+                    with timed(timings, 'resize'):
+                        current = current.resize(size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+                for output_format in formats:
+                    output_file = next(output_files)
+                    with timed(timings, 'encode'):
+                        outputs.append((output_file, encode_image(current, output_format, quality)))
+    return outputs
+
+
+def write_outputs(outputs, timings=None):
+    """Write rendered (output_file, bytes) pairs, return the list of files"""
+    with timed(timings, 'write'):
+        for output_file, data in outputs:
+            write_output(output_file, data)
+    return [output_file for output_file, _ in outputs]
+
+
+def convert_image(image_path, output_path, settings, timings=None):
+    """Convert and resize one image file, return the list of paths it was saved to
+
+    settings is a plain dict (format, quality, width, height, keep_aspect) so the
+    function can run in a worker process without touching any Tk variables.
+    Pass a dict as timings to get the seconds spent per stage added to it.
+    """
+    return write_outputs(render_image(image_path, image_path, output_path, settings, timings), timings)
+
+
+def convert_variants(image_path, output_path, widths, formats, quality=85, timings=None):
+    """Decode once and write each width in each format as <stem>_<width>w<ext>"""
+    outputs = render_variants(image_path, image_path, output_path, widths, formats, quality, timings)
+    return write_outputs(outputs, timings)
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_key(settings):
+    """Stable string for the effective settings, used as part of the manifest key"""
+    return json.dumps({**settings, 'pipeline': PIPELINE_VERSION}, sort_keys=True)
+
+
+class OutputManifest:
+    """Remembers which outputs are up to date, in a SQLite file in the output folder
+
+    Entries are keyed by source path and effective settings and store the
+    source's content hash. An unchanged size and mtime is trusted as-is; if
+    only the mtime moved, the source is re-hashed before deciding. Each output
+    file also records the source that wrote it, so a second source mapping to
+    the same file can be refused instead of overwriting it. Without an
+    output_path the manifest is a throwaway that only tracks one run's claims.
+    """
+    COMMIT_EVERY = 200
+
+    def __init__(self, output_path=None):
+        # An empty name gives a private temporary database that SQLite spills to disk
+        self.conn = sqlite3.connect(str(Path(output_path) / MANIFEST_NAME) if output_path is not None else "")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != MANIFEST_SCHEMA:
+            self.conn.execute("DROP TABLE IF EXISTS outputs")
+            self.conn.execute("DROP TABLE IF EXISTS output_owners")
+            self.conn.execute(f"PRAGMA user_version = {MANIFEST_SCHEMA}")
+        # outputs holds a JSON object mapping every output file to its size
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS outputs (
+                source_path TEXT NOT NULL,
+                settings TEXT NOT NULL,
+                source_hash TEXT NOT NULL,
+                source_size INTEGER NOT NULL,
+                source_mtime_ns INTEGER NOT NULL,
+                outputs TEXT NOT NULL,
+                PRIMARY KEY (source_path, settings)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS output_owners (
+                output_file TEXT PRIMARY KEY,
+                source_path TEXT NOT NULL
+            )
+        """)
+        # Outputs reserved by this run, before they are written (and then recorded)
+        self.conn.execute("""
+            CREATE TEMP TABLE run_claims (
+                output_file TEXT PRIMARY KEY,
+                source_path TEXT NOT NULL
+            )
+        """)
+        self.uncommitted = 0
+
+    def owner(self, output_file):
+        """Source that last wrote output_file, if it still exists"""
+        row = self.conn.execute("SELECT source_path FROM output_owners WHERE output_file = ?",
+                                (os.path.abspath(output_file),)).fetchone()
+        return row[0] if row is not None and os.path.exists(row[0]) else None
+
+    def claim(self, image_path, output_files):
+        """Reserve output files for image_path in this run
+
+        Returns (output file, other source) if another source already claimed or
+        produced one of them, in which case nothing is reserved.
+        """
+        source = os.path.abspath(image_path)
+        output_files = [os.path.abspath(output_file) for output_file in output_files]
+        for output_file in output_files:
+            row = self.conn.execute("SELECT source_path FROM run_claims WHERE output_file = ?",
+                                    (output_file,)).fetchone()
+            owner = row[0] if row is not None else self.owner(output_file)
+            if owner is not None and owner != source:
+                return output_file, owner
+        self.conn.executemany("INSERT OR REPLACE INTO run_claims VALUES (?, ?)",
+                              [(output_file, source) for output_file in output_files])
+        return None
+
+    def is_current(self, image_path, key):
+        """True if the recorded outputs for this source and settings can be reused"""
+        row = self.conn.execute(
+            "SELECT source_hash, source_size, source_mtime_ns, outputs "
+            "FROM outputs WHERE source_path = ? AND settings = ?",
+            (os.path.abspath(image_path), key)).fetchone()
+        if row is None:
+            return False
+        source_hash, source_size, source_mtime_ns, outputs = row
+
+        try:
+            for output_file, output_size in json.loads(outputs).items():
+                if os.stat(output_file).st_size != output_size:
+                    return False
+            source = os.stat(image_path)
+        except OSError:
+            return False
+
+        if source.st_size != source_size:
+            return False
+        if source.st_mtime_ns == source_mtime_ns:
+            return True
+        # Touched but possibly identical: compare contents, and remember the new mtime
+        if hash_file(image_path) != source_hash:
+            return False
+        self.conn.execute(
+            "UPDATE outputs SET source_mtime_ns = ? WHERE source_path = ? AND settings = ?",
+            (source.st_mtime_ns, os.path.abspath(image_path), key))
+        self._count_write()
+        return True
+
+    def record(self, image_path, key, entry):
+        """Store the result of a successful conversion"""
+        outputs = {str(output_file): os.stat(output_file).st_size for output_file in entry['output_files']}
+        self.conn.execute(
+            "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?, ?, ?)",
+            (os.path.abspath(image_path), key, entry['source_hash'], entry['source_size'],
+             entry['source_mtime_ns'], json.dumps(outputs)))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO output_owners VALUES (?, ?)",
+            [(os.path.abspath(output_file), os.path.abspath(image_path)) for output_file in outputs])
+        self._count_write()
+
+    def _count_write(self):
+        self.uncommitted += 1
+        if self.uncommitted >= self.COMMIT_EVERY:
+            self.conn.commit()
+            self.uncommitted = 0
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+class StageStats:
+    """Collects per-image stage timings and summarizes them
+
+    Feed it through iter_convert(stats=...) during any run; report() gives
+    latency percentiles per stage, overall images/sec and peak RSS.
+    """
+    STAGES = ['read', 'hash', 'decode', 'convert', 'resize', 'encode', 'write', 'total']
+
+    def __init__(self):
+        self.samples = {stage: [] for stage in self.STAGES}
+        self.images = 0
+        self.started = time.perf_counter()
+
+    def add(self, timings):
+        self.images += 1
+        for stage, seconds in timings.items():
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        stages = {}
+        for stage, values in self.samples.items():
+            if values:
+                values = sorted(values)
+                pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+                stages[stage] = {'count': len(values), 'mean': sum(values) / len(values),
+                                 'p50': pick(0.50), 'p90': pick(0.90), 'p99': pick(0.99)}
+        return {'images': self.images, 'elapsed': elapsed,
+                'images_per_sec': self.images / elapsed if elapsed else 0.0,
+                'peak_rss_mb': peak_rss_mb(), 'stages': stages}
+
+    def report(self):
+        summary = self.summary()
+        lines = [f"{'stage':<8} {'count':>6} {'mean ms':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}"]
+        for stage, row in summary['stages'].items():
+            lines.append(f"{stage:<8} {row['count']:>6} {row['mean'] * 1000:>9.1f} {row['p50'] * 1000:>9.1f} "
+                         f"{row['p90'] * 1000:>9.1f} {row['p99'] * 1000:>9.1f}")
+        lines.append(f"{summary['images']} images in {summary['elapsed']:.2f}s = "
+                     f"{summary['images_per_sec']:.1f} images/sec")
+        if summary['peak_rss_mb'] is not None:
+            lines.append(f"Peak RSS: {summary['peak_rss_mb']:.0f} MB (largest single process)")
+        return "\n".join(lines)
+
+
+def peak_rss_mb():
+    """Largest resident set of this process or any finished worker, or None if unknown"""
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _convert_safely(image_path, output_path, settings, profile=False):
+    """Run convert_image, returning (image_path, error message or None, manifest entry)"""
+    timings = {} if profile else None
+    start = time.perf_counter()
+    try:
+        # Stat before hashing, so a change made during processing is caught next run
+        source = os.stat(image_path)
+        with timed(timings, 'hash'):
+            source_hash = hash_file(image_path)
+        entry = {
+            'source_hash': source_hash,
+            'source_size': source.st_size,
+            'source_mtime_ns': source.st_mtime_ns,
+        }
+        entry['output_files'] = convert_image(image_path, output_path, settings, timings)
+        if profile:
+            timings['total'] = time.perf_counter() - start
+            entry['timings'] = timings
+        return image_path, None, entry
+    except Exception as e:
+        return image_path, str(e), None
+
+
+class StreamingPipeline:
+    """Staged read -> decode/transform/encode -> write pipeline on threads
+
+    A reader thread loads (and hashes) files while `workers` threads decode,
+    transform and encode, and a writer thread saves the results, so disk I/O
+    overlaps CPU work; Pillow releases the GIL while decoding, resampling and
+    encoding. Every queue between stages is bounded, so a slow stage stalls
+    the ones before it instead of piling up data, and a MemoryBudget caps the
+    decoded frames alive at once.
+    """
+
+    def __init__(self, settings, workers, memory_budget, profile=False):
+        self.settings = settings
+        self.profile = profile
+        self.budget = MemoryBudget(memory_budget)
+        self.paths = queue.Queue(maxsize=workers)
+        self.loaded = queue.Queue(maxsize=workers)
+        self.encoded = queue.Queue(maxsize=workers)
+        self.results = queue.Queue()
+        self.stopped = threading.Event()
+        # Most images between submit() and a result: three full queues plus one per thread
+        self.capacity = 4 * workers + 2
+
+        stages = [self._read] + [self._transform] * workers + [self._write]
+        for stage in stages:
+            threading.Thread(target=stage, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop all stages; work still in flight is dropped"""
+        self.stopped.set()
+
+    def submit(self, image_path, output_path):
+        self._put(self.paths, (image_path, output_path, {} if self.profile else None, time.perf_counter()))
+
+    def next_result(self):
+        """Block until an image is done: (image_path, error or None, manifest entry)"""
+        return self.results.get()
+
+    def _get(self, source):
+        while not self.stopped.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _put(self, target, item):
+        while not self.stopped.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _read(self):
+        while True:
+            task = self._get(self.paths)
+            if task is None:
+                return
+            image_path, output_path, timings, started = task
+            try:
+                source = os.stat(image_path)
+                with timed(timings, 'read'):
+                    with open(image_path, 'rb') as f:
+                        data = f.read()
+                with timed(timings, 'hash'):
+                    source_hash = hashlib.sha256(data).hexdigest()
+                entry = {'source_hash': source_hash, 'source_size': source.st_size,
+                         'source_mtime_ns': source.st_mtime_ns}
+            except Exception as e:
+                self.results.put((image_path, str(e), None))
+                continue
+            self._put(self.loaded, (image_path, output_path, data, entry, timings, started))
+
+    def _transform(self):
+        while True:
+            task = self._get(self.loaded)
+            if task is None:
+                return
+            image_path, output_path, data, entry, timings, started = task
+            try:
+                outputs = render_image(io.BytesIO(data), image_path, output_path,
+                                       self.settings, timings, self.budget)
+            except UnidentifiedImageError:
+                # Pillow's own message would name the in-memory buffer, not the file
+                self.results.put((image_path, f"cannot identify image file {str(image_path)!r}", None))
+                continue
+            except Exception as e:
+                self.results.put((image_path, str(e), None))
+                continue
+            finally:
+                del data, task
+            self._put(self.encoded, (image_path, outputs, entry, timings, started))
+
+    def _write(self):
+        while True:
+            task = self._get(self.encoded)
+            if task is None:
+                return
+            image_path, outputs, entry, timings, started = task
+            try:
+                entry['output_files'] = write_outputs(outputs, timings)
+            except Exception as e:
+                self.results.put((image_path, str(e), None))
+                continue
+            if timings is not None:
+                timings['total'] = time.perf_counter() - started
+                entry['timings'] = timings
+            self.results.put((image_path, None, entry))
+
+
+def iter_convert(image_paths, output_path, settings, workers=1, cancel_event=None, manifest=None,
+                 stats=None, pipeline=False, memory_budget=DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024):
+    """Convert images, yielding (image_path, error or None, skipped) as each one finishes
+
+    With pipeline=True the images stream through a StreamingPipeline with
+    `workers` transform threads and at most memory_budget bytes of decoded
+    frames. Otherwise, with workers > 1 the images are spread over a process
+    pool. Either way only a small window of images is in flight at a time, so
+    cancelling takes effect quickly and a huge selection is never queued all
+    at once. With a manifest, images whose output is already up to date are
+    reported as skipped, not converted. A StageStats passed as stats receives
+    the stage timings of every image. Items of image_paths are paths or
+    (path, relative folder) pairs, see split_image_item. An image whose output
+    file is already produced by another source, earlier in this run or in the
+    manifest, fails with an error instead of overwriting it. Claims are kept
+    in SQLite (a throwaway database without a manifest), not in memory.
+    """
+    cancelled = lambda: cancel_event is not None and cancel_event.is_set()
+    key = settings_key(settings)
+    profile = stats is not None
+    claims = manifest if manifest is not None else OutputManifest()
+
+    def claim(image_path, image_output):
+        """Reserve the image's output files, or return why another source owns one"""
+        try:
+            output_files = planned_outputs(image_path, image_output, settings)
+        except Exception:
+            return None  # unreadable: the conversion itself reports the error
+        clash = claims.claim(image_path, output_files)
+        return None if clash is None else "output {} is already produced by {}".format(*clash)
+
+    items = (split_image_item(item, output_path) for item in image_paths)
+
+    def is_current(image_path):
+        return manifest is not None and manifest.is_current(image_path, key)
+
+    def finish(result):
+        image_path, error, entry = result
+        if manifest is not None and entry is not None:
+            manifest.record(image_path, key, entry)
+        if stats is not None and entry is not None:
+            stats.add(entry['timings'])
+        return image_path, error, False
+
+    try:
+        if pipeline:
+            exhausted = False
+            in_flight = 0
+            with StreamingPipeline(settings, workers, memory_budget, profile) as stages:
+                while True:
+                    # Keep the pipeline fed without ever blocking on a full queue
+                    while not exhausted and in_flight < stages.capacity and not cancelled():
+                        image_path, image_output = next(items, (None, None))
+                        if image_path is None:
+                            exhausted = True
+                        elif is_current(image_path):
+                            yield image_path, None, True
+                        else:
+                            error = claim(image_path, image_output)
+                            if error is not None:
+                                yield image_path, error, False
+                            else:
+                                stages.submit(image_path, image_output)
+                                in_flight += 1
+                    if not in_flight or cancelled():
+                        return
+
+                    yield finish(stages.next_result())
+                    in_flight -= 1
+
+        if workers <= 1:
+            for image_path, image_output in items:
+                if cancelled():
+                    return
+                if is_current(image_path):
+                    yield image_path, None, True
+                else:
+                    error = claim(image_path, image_output)
+                    if error is not None:
+                        yield image_path, error, False
+                    else:
+                        yield finish(_convert_safely(image_path, image_output, settings, profile))
+            return
+
+        exhausted = False
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            while True:
+                # Top up the window, reporting up-to-date images straight away
+                while not exhausted and len(pending) < workers * 2 and not cancelled():
+                    image_path, image_output = next(items, (None, None))
+                    if image_path is None:
+                        exhausted = True
+                    elif is_current(image_path):
+                        yield image_path, None, True
+                    else:
+                        error = claim(image_path, image_output)
+                        if error is not None:
+                            yield image_path, error, False
+                        else:
+                            pending.add(executor.submit(_convert_safely, image_path, image_output,
+                                                        settings, profile))
+                if not pending:
+                    return
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield finish(future.result())
+                if cancelled():
+                    for future in pending:
+                        future.cancel()
+                    return
+    finally:
+        if claims is not manifest:
+            claims.close()
+
+def make_preview(image_path):
+    """Open an image and return (thumbnail, original size)"""
+    with Image.open(image_path) as image:
+        original_size = image.size
+        # With reducing_gap, thumbnail() drafts JPEGs so they are decoded near preview size
+        image.thumbnail(PREVIEW_SIZE, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+        return image, original_size
+
+
+class PreviewCache:
+    """LRU of preview thumbnails bounded by decoded size, optionally backed by a folder
+
+    Disk entries are keyed by the source path, size and mtime, so an edited
+    file never shows a stale preview. Safe to use from several threads.
+    """
+
+    def __init__(self, max_bytes=PREVIEW_CACHE_BYTES, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, image_path):
+        with self.lock:
+            preview = self.entries.get(image_path)
+            if preview is not None:
+                self.entries.move_to_end(image_path)
+                return preview
+
+        preview = self._read_disk(image_path)
+        if preview is not None:
+            self._remember(image_path, preview)
+        return preview
+
+    def put(self, image_path, preview):
+        self._remember(image_path, preview)
+        self._write_disk(image_path, preview)
+
+    def _remember(self, image_path, preview):
+        image = preview[0]
+        with self.lock:
+            if image_path in self.entries:
+                return
+            self.entries[image_path] = preview
+            self.size += image.width * image.height * len(image.getbands())
+            # Evict least recently used, but always keep the newest entry
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                _, (old, _) = self.entries.popitem(last=False)
+                self.size -= old.width * old.height * len(old.getbands())
+
+    def _disk_path(self, image_path):
+        stat = os.stat(image_path)
+        key = f"{os.path.abspath(image_path)}|{stat.st_size}|{stat.st_mtime_ns}|{PREVIEW_SIZE}"
+        return self.disk_dir / (hashlib.sha1(key.encode('utf-8')).hexdigest() + ".png")
+
+    def _read_disk(self, image_path):
+        if self.disk_dir is None:
+            return None
+        try:
+            with Image.open(self._disk_path(image_path)) as image:
+                image.load()
+                width, height = image.text['original_size'].split('x')
+                return image, (int(width), int(height))
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _write_disk(self, image_path, preview):
+        if self.disk_dir is None:
+            return
+        image, (width, height) = preview
+        info = PngInfo()
+        info.add_text('original_size', f"{width}x{height}")
+        try:
+            image.save(self._disk_path(image_path), format='PNG', pnginfo=info)
+        except (OSError, ValueError):
+            pass  # e.g. a mode PNG can't store; the memory cache still has it
+
+
+class PreviewLoader:
+    """Builds previews on a background thread, most recently requested first
+
+    Each request replaces the previous wish list, so scrolling quickly through
+    the list never leaves a backlog of previews nobody is looking at anymore.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.errors = {}
+        self.wanted = []
+        self.condition = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def request(self, image_paths):
+        with self.condition:
+            self.wanted = list(image_paths)
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.wanted:
+                    self.condition.wait()
+                image_path = self.wanted.pop(0)
+
+            if image_path in self.errors or self.cache.get(image_path) is not None:
+                continue
+            try:
+                self.cache.put(image_path, make_preview(image_path))
+            except Exception as e:
+                self.errors[image_path] = str(e)
+
 
 class ImageConverterResizer:
     def __init__(self, root):
@@ -20,6 +925,23 @@ class ImageConverterResizer:
         self.resize_height = tk.IntVar(value=600)
         self.keep_aspect = tk.BooleanVar(value=True)
         self.format_var = tk.StringVar(value="Same as original")
+        self.workers = tk.IntVar(value=os.cpu_count() or 1)
+        self.skip_unchanged = tk.BooleanVar(value=True)
+        self.profile = tk.BooleanVar(value=False)
+        self.use_pipeline = tk.BooleanVar(value=True)
+        self.memory_budget = tk.IntVar(value=DEFAULT_MEMORY_BUDGET_MB)
+        self.variant_widths = tk.StringVar(value="")
+        self.variant_formats = tk.StringVar(value="WEBP,JPEG")
+        
+        # Background processing state
+        self.progress_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker_thread = None
+        
+        # Preview thumbnails, generated off the main thread
+        self.preview_cache = PreviewCache(disk_dir=os.environ.get("IMAGE_PREVIEW_CACHE_DIR"))
+        self.preview_loader = PreviewLoader(self.preview_cache)
+        self.preview_path = None
         
         self.setup_ui()
         
@@ -65,7 +987,7 @@ class ImageConverterResizer:
         # Format conversion
         ttk.Label(options_frame, text="Convert to:").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
         format_combo = ttk.Combobox(options_frame, textvariable=self.format_var,
-                                   values=["Same as original", "JPEG", "PNG", "WEBP", "BMP"])
+                                   values=OUTPUT_FORMATS)
         format_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(0, 10))
         format_combo.set("Same as original")
         
@@ -95,6 +1017,29 @@ class ImageConverterResizer:
         ttk.Button(options_frame, text="Browse", 
                   command=self.select_output_folder).grid(row=3, column=2, padx=(10, 0))
         
+        # Parallel workers
+        ttk.Label(options_frame, text="Workers:").grid(row=4, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        ttk.Spinbox(options_frame, from_=1, to=os.cpu_count() or 1, textvariable=self.workers,
+                    width=6).grid(row=4, column=1, sticky=tk.W, pady=(10, 0))
+        ttk.Checkbutton(options_frame, text="Skip unchanged images",
+                        variable=self.skip_unchanged).grid(row=4, column=2, pady=(10, 0))
+        
+        # Variant set: several widths/formats from one decode (leave widths empty to disable)
+        ttk.Label(options_frame, text="Variant widths:").grid(row=5, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        ttk.Entry(options_frame, textvariable=self.variant_widths).grid(row=5, column=1, sticky=(tk.W, tk.E), pady=(10, 0))
+        ttk.Label(options_frame, text="e.g. 1600,800,320").grid(row=5, column=2, padx=(10, 0), pady=(10, 0))
+        ttk.Label(options_frame, text="Variant formats:").grid(row=6, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        ttk.Entry(options_frame, textvariable=self.variant_formats).grid(row=6, column=1, sticky=(tk.W, tk.E), pady=(10, 0))
+        ttk.Checkbutton(options_frame, text="Profile stages",
+                        variable=self.profile).grid(row=6, column=2, pady=(10, 0))
+        
+        # Streaming pipeline (threads, bounded memory) or one process per worker
+        ttk.Label(options_frame, text="Memory budget (MB):").grid(row=7, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        ttk.Spinbox(options_frame, from_=64, to=65536, increment=64, textvariable=self.memory_budget,
+                    width=8).grid(row=7, column=1, sticky=tk.W, pady=(10, 0))
+        ttk.Checkbutton(options_frame, text="Streaming pipeline",
+                        variable=self.use_pipeline).grid(row=7, column=2, pady=(10, 0))
+        
         # Bind events
         quality_scale.configure(command=self.update_quality_label)
         self.resize_width.trace('w', self.update_aspect_ratio)
@@ -124,6 +1069,10 @@ class ImageConverterResizer:
         ttk.Button(button_frame, text="Clear All", 
                   command=self.clear_all).grid(row=0, column=1, padx=(0, 10))
         
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", state="disabled",
+                                        command=self.cancel_processing)
+        self.cancel_button.grid(row=0, column=2, padx=(0, 10))
+        
         # Progress bar
         self.progress = ttk.Progressbar(main_frame, mode='determinate')
         self.progress.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 0))
@@ -164,9 +1113,11 @@ class ImageConverterResizer:
             for file in self.images:
                 self.files_listbox.insert(tk.END, os.path.basename(file))
             self.upload_status.config(text=f"{len(self.images)} image(s) selected")
+            self.preview_loader.request(self.images[:PREVIEW_PREFETCH + 1])
             
     def clear_selection(self):
         self.images = []
+        self.preview_path = None
         self.files_listbox.delete(0, tk.END)
         self.upload_status.config(text="No images selected")
         self.preview_label.config(image='', text="Select an image to preview")
@@ -186,14 +1137,33 @@ class ImageConverterResizer:
         if not selection:
             return
             
-        file_path = self.images[selection[0]]
+        index = selection[0]
+        file_path = self.images[index]
+        
+        # Ask for the neighbours as well, so stepping through the list finds them ready
+        neighbours = [self.images[index + step] for distance in range(1, PREVIEW_PREFETCH + 1)
+                      for step in (distance, -distance) if 0 <= index + step < len(self.images)]
+        self.preview_loader.request([file_path] + neighbours)
+        self.preview_path = file_path
+        self.display_preview(file_path)
+        
+    def display_preview(self, file_path):
+        """Show the cached preview, or check back shortly while the loader builds it"""
+        if file_path != self.preview_path:
+            return  # the selection has moved on
+        
+        preview = self.preview_cache.get(file_path)
+        if preview is None:
+            error = self.preview_loader.errors.pop(file_path, None)
+            if error is not None:
+                messagebox.showerror("Error", f"Could not load image: {error}")
+                return
+            self.preview_label.config(image='', text="Loading preview...")
+            self.root.after(PREVIEW_POLL_MS, self.display_preview, file_path)
+            return
+        
         try:
-            image = Image.open(file_path)
-            self.original_width, self.original_height = image.size
-            
-            # Resize for preview while maintaining aspect ratio
-            preview_size = (300, 200)
-            image.thumbnail(preview_size, Image.Resampling.LANCZOS)
+            image, (self.original_width, self.original_height) = preview
             
             photo = ImageTk.PhotoImage(image)
             self.preview_label.config(image=photo, text="")
@@ -212,105 +1182,274 @@ class ImageConverterResizer:
             messagebox.showwarning("Warning", "Please select at least one image to process.")
             return
             
+        if self.worker_thread and self.worker_thread.is_alive():
+            messagebox.showwarning("Warning", "Images are already being processed.")
+            return
+        
+        # Read the Tk variables here, on the main thread; workers only see plain values
+        try:
+            settings = self.get_settings()
+        except (ValueError, tk.TclError) as e:
+            messagebox.showerror("Error", f"Invalid processing options: {str(e)}")
+            return
+        try:
+            workers = max(1, self.workers.get())
+        except tk.TclError:
+            workers = 1
+        try:
+            memory_budget = max(1, self.memory_budget.get()) * 1024 * 1024
+        except tk.TclError:
+            memory_budget = DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024
+        
+        self.cancel_event.clear()
+        self.cancel_button.config(state="normal")
+        self.progress['value'] = 0
+        
         # Run processing in a separate thread to keep UI responsive
-        thread = threading.Thread(target=self._process_images_thread)
-        thread.daemon = True
-        thread.start()
+        self.worker_thread = threading.Thread(
+            target=self._process_images_thread,
+            args=(list(self.images), Path(self.output_folder.get()), settings, workers,
+                  self.skip_unchanged.get(), self.profile.get(), self.use_pipeline.get(), memory_budget))
+        self.worker_thread.daemon = True
+        self.worker_thread.start()
+        self.root.after(POLL_INTERVAL_MS, self._poll_progress)
+        
+    def cancel_processing(self):
+        self.cancel_event.set()
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text="Cancelling...")
         
-    def _process_images_thread(self):
+    def get_settings(self):
+        """Snapshot the processing options as a plain dict"""
+        return make_settings(self.format_var.get(), self.quality.get(),
+                             self.resize_width.get(), self.resize_height.get(),
+                             self.keep_aspect.get(),
+                             parse_list(self.variant_widths.get(), int),
+                             parse_list(self.variant_formats.get()))
+        
+    def _process_images_thread(self, images, output_path, settings, workers, skip_unchanged=True, profile=False,
+                               pipeline=True, memory_budget=DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024):
+        # Runs off the main thread: never touch widgets here, report through the queue
+        total_images = len(images)
+        processed = skipped = 0
+        manifest = None
+        stats = StageStats() if profile else None
         try:
-            total_images = len(self.images)
-            processed = 0
-            
             # Create output folder if it doesn't exist
-            output_path = Path(self.output_folder.get())
             output_path.mkdir(exist_ok=True)
+            if skip_unchanged:
+                manifest = OutputManifest(output_path)
             
-            for i, image_path in enumerate(self.images):
-                try:
-                    self.status_label.config(text=f"Processing {i+1}/{total_images}: {os.path.basename(image_path)}")
-                    
-                    # Update progress
-                    self.progress['value'] = (i / total_images) * 100
-                    self.root.update_idletasks()
-                    
-                    # Process image
-                    self.process_single_image(image_path, output_path)
+            results = iter_convert(images, output_path, settings, workers, self.cancel_event, manifest, stats,
+                                   pipeline, memory_budget)
+            for done, (image_path, error, was_skipped) in enumerate(results, start=1):
+                if error is None:
                     processed += 1
-                    
-                except Exception as e:
-                    print(f"Error processing {image_path}: {str(e)}")
-                    continue
-                    
-            # Final update
-            self.progress['value'] = 100
-            self.status_label.config(text=f"Completed! {processed}/{total_images} images processed successfully.")
+                    skipped += was_skipped
+                else:
+                    self.progress_queue.put(("error", image_path, error))
+                self.progress_queue.put(("progress", done, total_images, image_path))
+                
+            if stats is not None:
+                self.progress_queue.put(("stats", stats.report()))
+            self.progress_queue.put(("done", processed, skipped, total_images, self.cancel_event.is_set()))
             
-            messagebox.showinfo("Success", 
-                              f"Processing completed!\n{processed}/{total_images} images processed successfully.")
-                              
         except Exception as e:
-            messagebox.showerror("Error", f"Processing failed: {str(e)}")
-            self.status_label.config(text="Processing failed")
+            self.progress_queue.put(("failed", str(e)))
+        finally:
+            if manifest is not None:
+                manifest.close()
             
-    def process_single_image(self, image_path, output_path):
-        with Image.open(image_path) as img:
-            # Convert to RGB if necessary (for JPEG)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                img = img.convert('RGB')
+    def _poll_progress(self):
+        """Apply queued progress messages on the Tk main thread"""
+        finished = False
+        while True:
+            try:
+                message = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
             
-            # Resize image
-            if self.resize_width.get() != img.width or self.resize_height.get() != img.height:
-                if self.keep_aspect.get():
-                    img = self.resize_with_aspect(img, self.resize_width.get(), self.resize_height.get())
+            kind = message[0]
+            if kind == "progress":
+                _, done, total_images, image_path = message
+                self.progress['value'] = (done / total_images) * 100
+                self.status_label.config(text=f"Processed {done}/{total_images}: {os.path.basename(image_path)}")
+            elif kind == "error":
+                _, image_path, error = message
+                print(f"Error processing {image_path}: {error}")
+            elif kind == "stats":
+                print(message[1])
+            elif kind == "done":
+                _, processed, skipped, total_images, cancelled = message
+                finished = True
+                unchanged = f" ({skipped} already up to date)" if skipped else ""
+                if cancelled:
+                    self.status_label.config(text=f"Cancelled. {processed}/{total_images} images processed{unchanged}.")
                 else:
-                    img = img.resize((self.resize_width.get(), self.resize_height.get()), Image.Resampling.LANCZOS)
-            
-            # Determine output format
-            if self.format_var.get() == "Same as original":
-                output_format = img.format or 'JPEG'
-            else:
-                output_format = self.format_var.get()
-            
-            # Prepare output filename
-            original_name = Path(image_path).stem
-            extension = self.get_extension(output_format)
-            output_file = output_path / f"{original_name}_processed{extension}"
-            
-            # Save with appropriate options
-            save_kwargs = {}
-            if output_format.upper() == 'JPEG':
-                save_kwargs['quality'] = self.quality.get()
-                save_kwargs['optimize'] = True
-            elif output_format.upper() == 'PNG':
-                save_kwargs['optimize'] = True
-            elif output_format.upper() == 'WEBP':
-                save_kwargs['quality'] = self.quality.get()
+                    # Final update
+                    self.progress['value'] = 100
+                    self.status_label.config(text=f"Completed! {processed}/{total_images} images processed successfully{unchanged}.")
+                    messagebox.showinfo("Success", 
+                                      f"Processing completed!\n{processed}/{total_images} images processed successfully{unchanged}.")
+            elif kind == "failed":
+                finished = True
+                messagebox.showerror("Error", f"Processing failed: {message[1]}")
+                self.status_label.config(text="Processing failed")
+        
+        if finished:
+            self.cancel_button.config(state="disabled")
+        else:
+            self.root.after(POLL_INTERVAL_MS, self._poll_progress)
             
-            img.save(output_file, format=output_format, **save_kwargs)
+    def process_single_image(self, image_path, output_path):
+        return convert_image(image_path, output_path, self.get_settings())
     
     def resize_with_aspect(self, image, target_width, target_height):
         """Resize image while maintaining aspect ratio"""
-        original_width, original_height = image.size
-        ratio = min(target_width / original_width, target_height / original_height)
-        new_width = int(original_width * ratio)
-        new_height = int(original_height * ratio)
-        return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        return resize_with_aspect(image, target_width, target_height)
     
     def get_extension(self, format_name):
         """Get file extension for given format"""
-        extensions = {
-            'JPEG': '.jpg',
-            'JPG': '.jpg',
-            'PNG': '.png',
-            'WEBP': '.webp',
-            'BMP': '.bmp',
-            'GIF': '.gif',
-            'TIFF': '.tiff'
-        }
-        return extensions.get(format_name.upper(), '.jpg')
+        return get_extension(format_name)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Convert and resize images without the GUI. Run with no arguments to open the GUI.")
+    parser.add_argument("inputs", nargs="*", help="image files and/or directories to process")
+    parser.add_argument("-o", "--output", default=os.getcwd(), help="output folder (default: current directory)")
+    parser.add_argument("-f", "--format", default="Same as original",
+                        type=lambda value: value if value == "Same as original" else value.upper(),
+                        choices=OUTPUT_FORMATS, help="output format (default: same as original)")
+    parser.add_argument("-q", "--quality", type=int, default=85, help="JPEG/WEBP quality 1-100 (default: 85)")
+    parser.add_argument("--width", type=int, default=800, help="target width (default: 800)")
+    parser.add_argument("--height", type=int, default=600, help="target height (default: 600)")
+    parser.add_argument("--no-keep-aspect", dest="keep_aspect", action="store_false",
+                        help="stretch to exactly width x height")
+    parser.add_argument("--no-recursive", dest="recursive", action="store_false",
+                        help="do not descend into subdirectories")
+    parser.add_argument("--variants", type=lambda value: parse_list(value, int), metavar="WIDTHS",
+                        help="variant-set mode: comma-separated widths, e.g. 1600,800,320")
+    parser.add_argument("--variant-formats", type=parse_list, default=["WEBP", "JPEG"], metavar="FORMATS",
+                        help="formats for every variant (default: WEBP,JPEG)")
+    parser.add_argument("--force", action="store_true",
+                        help="reprocess every image, even if its output is up to date")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="stream through a threaded read/transform/write pipeline instead of a process pool")
+    parser.add_argument("--memory-budget", type=int, default=DEFAULT_MEMORY_BUDGET_MB, metavar="MB",
+                        help=f"pipeline cap on decoded image memory (default: {DEFAULT_MEMORY_BUDGET_MB})")
+    parser.add_argument("--profile", action="store_true",
+                        help="report per-stage timings, throughput and peak memory at the end")
+    parser.add_argument("--benchmark", type=int, nargs="?", const=12, metavar="COUNT",
+                        help="convert COUNT generated synthetic images (default 12) and report timings")
+    args = parser.parse_args(argv)
+    if not args.inputs and args.benchmark is None:
+        parser.error("at least one input file or directory is required")
+    # Outputs written into a folder being scanned would be picked up and converted again
+    for path in args.inputs:
+        if os.path.isdir(path) and os.path.realpath(path) == os.path.realpath(args.output):
+            parser.error(f"input folder {path} is the output folder; choose another one with -o")
+    return args
+
+
+def make_benchmark_corpus(folder, count):
+    """Write count reproducible synthetic images of varied sizes and formats, return their paths"""
+    paths = []
+    for i in range(count):
+        size = BENCHMARK_SIZES[i % len(BENCHMARK_SIZES)]
+        output_format = BENCHMARK_FORMATS[(i // len(BENCHMARK_SIZES)) % len(BENCHMARK_FORMATS)]
+
+        # Fractal detail plus gradients: deterministic, and not trivially compressible
+        extent = (-2.0 + i * 0.01, -1.2, 0.8, 1.2)
+        detail = Image.effect_mandelbrot((size[0] // 4, size[1] // 4), extent, 64).resize(size, Image.Resampling.BICUBIC)
+        red = Image.linear_gradient('L').resize(size)
+        blue = Image.radial_gradient('L').resize(size)
+        img = Image.merge('RGB', (red, detail, blue))
+        if output_format == 'PNG':
+            img.putalpha(detail)  # exercises the RGBA -> RGB conversion
+
+        path = Path(folder) / f"synthetic_{i:03d}_{size[0]}x{size[1]}{get_extension(output_format)}"
+        img.save(path, format=output_format)
+        paths.append(path)
+    return paths
+
+
+def _benchmark_conversion(images, output_path, settings, workers, pipeline, memory_budget):
+    """Convert the corpus and return (failed count, stage report)"""
+    stats = StageStats()
+    results = iter_convert(images, output_path, settings, workers, stats=stats,
+                           pipeline=pipeline, memory_budget=memory_budget)
+    failed = sum(1 for _, error, _ in results if error is not None)
+    return failed, stats.report()
+
+
+def run_benchmark(count, settings, workers, pipeline=False, memory_budget=DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024):
+    """Time the pipeline on a generated corpus and print the stage report"""
+    with tempfile.TemporaryDirectory() as folder:
+        corpus, output_path = Path(folder) / "corpus", Path(folder) / "output"
+        corpus.mkdir()
+        output_path.mkdir()
+        # Generate and convert in separate fresh processes: a process inherits its parent's
+        # peak RSS, so the conversion's peak must not include the corpus generation
+        spawn = multiprocessing.get_context('spawn')
+        print(f"Generating {count} synthetic images...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as child:
+            images = child.submit(make_benchmark_corpus, corpus, count).result()
+
+        print(f"Converting with {workers} worker(s){' in the streaming pipeline' if pipeline else ''}...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as child:
+            failed, report = child.submit(_benchmark_conversion, images, output_path, settings, workers,
+                                          pipeline, memory_budget).result()
+        print(report)
+    return 1 if failed else 0
+
+
+def run_cli(argv):
+    """Batch-convert from the command line; returns the process exit code"""
+    args = parse_args(argv)
+    settings = make_settings(args.format, args.quality, args.width, args.height, args.keep_aspect,
+                             args.variants, args.variant_formats)
+    memory_budget = max(1, args.memory_budget) * 1024 * 1024
+    if args.benchmark is not None:
+        return run_benchmark(args.benchmark, settings, max(1, args.workers), args.pipeline, memory_budget)
+
+    output_path = Path(args.output)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    manifest = None if args.force else OutputManifest(output_path)
+    stats = StageStats() if args.profile else None
+    processed = skipped = failed = 0
+    images = iter_image_files(args.inputs, args.recursive, exclude=output_path)
+    try:
+        results = iter_convert(images, output_path, settings, max(1, args.workers), manifest=manifest,
+                               stats=stats, pipeline=args.pipeline, memory_budget=memory_budget)
+        for image_path, error, was_skipped in results:
+            if error is None:
+                processed += 1
+                skipped += was_skipped
+                print(f"[{processed + failed}] {image_path}{' (up to date)' if was_skipped else ''}")
+            else:
+                failed += 1
+                print(f"Error processing {image_path}: {error}", file=sys.stderr)
+    finally:
+        if manifest is not None:
+            manifest.close()
+
+    print(f"Completed! {processed}/{processed + failed} images processed successfully "
+          f"({skipped} already up to date).")
+    if stats is not None:
+        print(stats.report())
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(run_cli(argv))
+    if tk is None:
+        sys.exit("tkinter is not available; pass image files or folders to use the command line instead")
 
-def main():
     root = tk.Tk()
     app = ImageConverterResizer(root)
     root.mainloop()
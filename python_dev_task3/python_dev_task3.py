@@ -1,12 +1,485 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+try:
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, ttk
+except ImportError:   # headless server: only the batch CLI is available
+    tk = None
 import pyttsx3
 import PyPDF2
 import threading
-import time
+import hashlib
+import itertools
+import queue
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import textwrap
+import wave
 import os
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 
 audio_output_path = "temp_audio.wav"
+text_cache_path = "pdf_text_cache.db"
+PAGES_PER_CHUNK = 16   # pages a worker process extracts per task
+CHUNK_CHARS = 1000     # text per synthesized segment; small enough that playback starts quickly
+WAV_BLOCK_FRAMES = 1 << 16
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+POLL_INTERVAL_MS = 100
+DEFAULT_RATE = 150
+
+progress_queue = queue.Queue()      # worker thread -> Tk main thread
+cancel_event = threading.Event()
+active_player = None
+
+
+# -------- PDF TEXT EXTRACTION ----------
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_page_range(pdf_file, start, stop):
+    # Runs in a worker process: open the PDF once per chunk, not once per page
+    with open(pdf_file, 'rb') as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        return start, [pdf_reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def page_chunks(pages, size):
+    # Group sorted page numbers into (start, stop) runs of consecutive pages
+    chunks = []
+    for page in pages:
+        if chunks and chunks[-1][1] == page and page - chunks[-1][0] < size:
+            chunks[-1][1] = page + 1
+        else:
+            chunks.append([page, page + 1])
+    return [tuple(chunk) for chunk in chunks]
+
+
+def open_text_cache(path=text_cache_path):
+    conn = sqlite3.connect(path, timeout=30)   # batch processes share the cache
+    # WAL lets one process commit extracted pages while others are reading
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS page_text (
+            file_hash TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            PRIMARY KEY (file_hash, page)
+        )
+    """)
+    return conn
+
+
+def cache_pdf_text(pdf_file, on_progress=None, workers=None, cache_path=text_cache_path,
+                   cancel_event=None):
+    """Make sure every page's text is in the cache, extracting missing pages in a process pool.
+
+    on_progress(done_pages, total_pages) is called as pages (or pooled chunks) finish.
+    Setting cancel_event stops early; pages done so far stay cached. Returns the file hash
+    the pages are cached under.
+    """
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    file_hash = hash_file(pdf_file)
+    with open(pdf_file, 'rb') as f:
+        total_pages = len(PyPDF2.PdfReader(f).pages)
+
+    conn = open_text_cache(cache_path)
+    try:
+        cached = {page for (page,) in conn.execute(
+            "SELECT page FROM page_text WHERE file_hash = ?", (file_hash,))}
+        chunks = page_chunks([i for i in range(total_pages) if i not in cached], PAGES_PER_CHUNK)
+        done = len(cached)
+
+        def store(start, texts):
+            nonlocal done
+            conn.executemany(
+                "INSERT OR REPLACE INTO page_text (file_hash, page, text) VALUES (?, ?, ?)",
+                [(file_hash, start + i, text) for i, text in enumerate(texts)])
+            conn.commit()
+            done += len(texts)
+            if on_progress:
+                on_progress(done, total_pages)
+
+        if on_progress:
+            on_progress(done, total_pages)
+
+        if len(chunks) <= 1 or workers == 1:
+            # A single chunk is not worth starting worker processes for
+            with open(pdf_file, 'rb') as f:
+                pdf_reader = PyPDF2.PdfReader(f)
+                for start, stop in chunks:
+                    for i in range(start, stop):
+                        if cancelled():
+                            break
+                        store(i, [pdf_reader.pages[i].extract_text() or ""])
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(extract_page_range, pdf_file, start, stop)
+                           for start, stop in chunks]
+                for future in as_completed(futures):
+                    store(*future.result())
+                    if cancelled():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+    finally:
+        conn.close()
+
+    return file_hash
+
+
+def iter_pdf_pages(file_hash, cache_path=text_cache_path):
+    # Stream cached pages in order so the whole book never has to sit in memory. Each page
+    # is its own short query: a cursor left open across synthesis would hold a read lock
+    # on the cache for minutes.
+    conn = open_text_cache(cache_path)
+    try:
+        page = -1
+        while True:
+            row = conn.execute(
+                "SELECT page, text FROM page_text WHERE file_hash = ? AND page > ? "
+                "ORDER BY page LIMIT 1", (file_hash, page)).fetchone()
+            if row is None:
+                return
+            page, text = row
+            yield text
+    finally:
+        conn.close()
+
+
+def cached_text_length(file_hash, cache_path=text_cache_path):
+    conn = open_text_cache(cache_path)
+    try:
+        return conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(text)), 0) FROM page_text WHERE file_hash = ?",
+            (file_hash,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+# -------- TEXT TO SPEECH ----------
+
+def split_sentences(text, max_chars):
+    # Normalise PDF line breaks, and hard-wrap the odd sentence that is longer than a chunk
+    sentence = " ".join(text.split())
+    if len(sentence) <= max_chars:
+        return [sentence] if sentence else []
+    return textwrap.wrap(sentence, max_chars)
+
+
+def iter_text_chunks(pages, max_chars=CHUNK_CHARS):
+    """Yield speakable chunks of at most max_chars, broken at paragraph and sentence ends.
+
+    Works on an iterable of page texts, so only one page and one chunk are held at a time.
+    """
+    chunk, size, tail = [], 0, ""
+
+    def add(piece):
+        nonlocal chunk, size
+        for sentence in split_sentences(piece, max_chars):
+            if chunk and size + len(sentence) + 1 > max_chars:
+                yield " ".join(chunk)
+                chunk, size = [], 0
+            chunk.append(sentence)
+            size += len(sentence) + 1
+
+    for page in pages:
+        pieces = SENTENCE_END.split(tail + "\n" + page if tail else page)
+        tail = pieces.pop()   # may be a sentence that continues on the next page
+        if len(tail) > max_chars:
+            pieces.append(tail)
+            tail = ""
+        for piece in pieces:
+            yield from add(piece)
+
+    yield from add(tail)
+    if chunk:
+        yield " ".join(chunk)
+
+
+def new_segment_path():
+    fd, path = tempfile.mkstemp(prefix="pdf_audio_", suffix=".wav")
+    os.close(fd)
+    return path
+
+
+tts_engine = None   # one engine per process, created by init_tts_engine
+
+
+def init_tts_engine(rate):
+    global tts_engine
+    tts_engine = pyttsx3.init()
+    tts_engine.setProperty("rate", rate)
+
+
+def synthesize_chunk(chunk):
+    segment_path = new_segment_path()
+    tts_engine.save_to_file(chunk, segment_path)
+    tts_engine.runAndWait()
+    return segment_path
+
+
+def synthesize_segments(chunks, rate, workers=1):
+    """Synthesize each text chunk to its own WAV segment, yielding (path, chars) in order.
+
+    With workers > 1 chunks are fanned out to a process pool, each process with its own
+    engine. Only a small window of chunks is in flight, and results come back in text order.
+    """
+    if workers <= 1:
+        init_tts_engine(rate)
+        for chunk in chunks:
+            yield synthesize_chunk(chunk), len(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_tts_engine,
+                             initargs=(rate,)) as executor:
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append((executor.submit(synthesize_chunk, chunk), len(chunk)))
+                if len(pending) >= workers * 2:
+                    future, chars = pending.popleft()
+                    yield future.result(), chars
+            while pending:
+                future, chars = pending.popleft()
+                yield future.result(), chars
+        finally:
+            # Stopped early: drop queued chunks and delete segments nobody will read
+            for future, _ in pending:
+                if not future.cancel():
+                    try:
+                        os.remove(future.result())
+                    except Exception:
+                        pass
+
+
+def write_audio(segments, output_path, on_segment=None):
+    """Append WAV segments to output_path as they arrive, block by block.
+
+    Segments are deleted once written, unless on_segment(path) is given, which then
+    owns the file (e.g. to play it first). Yields the number of characters written so far.
+    """
+    tmp_path = output_path + ".part"
+    writer = None
+    done_chars = 0
+    finished = False
+    try:
+        for segment_path, chars in segments:
+            try:
+                with wave.open(segment_path, 'rb') as reader:
+                    if writer is None:
+                        writer = wave.open(tmp_path, 'wb')
+                        writer.setparams(reader.getparams())
+                    while True:
+                        frames = reader.readframes(WAV_BLOCK_FRAMES)
+                        if not frames:
+                            break
+                        writer.writeframesraw(frames)
+            finally:
+                if on_segment:
+                    on_segment(segment_path)
+                else:
+                    os.remove(segment_path)
+            done_chars += chars
+            yield done_chars
+        finished = True
+    finally:
+        if writer is not None:
+            writer.close()   # patches the header with the final frame count
+            if not finished:
+                os.remove(tmp_path)
+
+    if writer is None:
+        raise ValueError("No audio was produced")
+    os.replace(tmp_path, output_path)
+
+
+def play_wav(path):
+    # Blocking playback of a WAV file with whatever the platform provides
+    if sys.platform == "win32":
+        import winsound
+        winsound.PlaySound(path, winsound.SND_FILENAME)
+    else:
+        player = ["afplay"] if sys.platform == "darwin" else ["aplay", "-q"]
+        subprocess.run(player + [path], check=False)
+
+
+class SegmentPlayer:
+    """Plays segments in order on a background thread while the rest are still synthesizing"""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def add(self, segment_path):
+        self.queue.put(segment_path)
+
+    def finish(self):
+        self.queue.put(None)
+
+    def stop(self):
+        self.stopped.set()
+        self.queue.put(None)
+
+    def _run(self):
+        while True:
+            segment_path = self.queue.get()
+            if segment_path is None:
+                break
+            try:
+                if not self.stopped.is_set():
+                    play_wav(segment_path)
+            except OSError:
+                self.stopped.set()   # no audio player available; just clean up
+            finally:
+                os.remove(segment_path)
+
+
+# -------- CONVERSION ----------
+
+def convert_pdf(pdf_file, output_path, rate=DEFAULT_RATE, workers=1, on_progress=None,
+                cancel_event=None, on_segment=None, cache_path=text_cache_path):
+    """Convert one PDF into a WAV file at output_path.
+
+    on_progress(percent, status) is called per extracted page and per synthesized chunk.
+    Returns False if cancel_event was set before the audio was complete, and raises
+    ValueError if the PDF has no readable text.
+    """
+    def report(value, status):
+        if on_progress:
+            on_progress(value, status)
+
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    file_hash = cache_pdf_text(
+        pdf_file,
+        on_progress=lambda done, total: report(
+            int(done / max(total, 1) * 30), f"Extracting text: page {done} of {total}"),
+        workers=workers, cache_path=cache_path, cancel_event=cancel_event)
+    if cancelled():
+        return False
+
+    chunks = iter_text_chunks(iter_pdf_pages(file_hash, cache_path))
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        raise ValueError("No readable text found!")
+    total_chars = max(cached_text_length(file_hash, cache_path), 1)
+
+    # Synthesize chunk by chunk, appending to the output as segments arrive
+    segments = synthesize_segments(itertools.chain([first_chunk], chunks), rate, workers=workers)
+    audio = write_audio(segments, output_path, on_segment=on_segment)
+    try:
+        for count, done_chars in enumerate(audio, 1):
+            report(30 + min(70, int(done_chars / total_chars * 70)),
+                   f"Synthesized chunk {count} ({done_chars:,} of ~{total_chars:,} characters)")
+            if cancelled():
+                return False
+    finally:
+        audio.close()
+        segments.close()
+    return True
+
+
+# -------- BATCH CLI ----------
+
+def batch_jobs(inputs, output_dir=None):
+    """Expand input files and directories into (pdf, wav) pairs"""
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            for pdf in sorted(p for p in path.rglob("*") if p.suffix.lower() == ".pdf"):
+                out_dir = Path(output_dir) / pdf.parent.relative_to(path) if output_dir else pdf.parent
+                yield str(pdf), str(out_dir / (pdf.stem + ".wav"))
+        else:
+            out_dir = Path(output_dir) if output_dir else path.parent
+            yield str(path), str(out_dir / (path.stem + ".wav"))
+
+
+def is_finished(pdf_file, output_path):
+    # Outputs are only renamed into place once complete, so existing means done
+    return (os.path.exists(output_path)
+            and os.path.getmtime(output_path) >= os.path.getmtime(pdf_file))
+
+
+def convert_job(pdf_file, output_path, rate, workers):
+    try:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        convert_pdf(pdf_file, output_path, rate, workers)
+        return pdf_file, None
+    except Exception as e:
+        return pdf_file, str(e)
+
+
+def run_batch(jobs, rate=DEFAULT_RATE, workers=1, force=False, log=print):
+    """Convert (pdf, wav) jobs, skipping finished ones; returns the number of failures.
+
+    Up to `workers` files run at once in separate processes. With a single file left, its
+    chunks are spread over the workers instead.
+    """
+    todo = []
+    for pdf_file, output_path in jobs:
+        if not force and is_finished(pdf_file, output_path):
+            log(f"skipped   {pdf_file}")
+        else:
+            todo.append((pdf_file, output_path))
+
+    failed = 0
+
+    def record(pdf_file, error):
+        nonlocal failed
+        if error:
+            failed += 1
+            log(f"failed    {pdf_file}: {error}")
+        else:
+            log(f"converted {pdf_file}")
+
+    concurrent = min(workers, len(todo))
+    if concurrent <= 1:
+        for pdf_file, output_path in todo:
+            record(*convert_job(pdf_file, output_path, rate, workers))
+    else:
+        with ProcessPoolExecutor(max_workers=concurrent) as executor:
+            futures = [executor.submit(convert_job, pdf_file, output_path, rate, 1)
+                       for pdf_file, output_path in todo]
+            for future in as_completed(futures):
+                record(*future.result())
+    return failed
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Convert PDFs to WAV audiobooks. Run without arguments for the GUI.")
+    parser.add_argument("inputs", nargs="+", help="PDF files or directories of PDFs")
+    parser.add_argument("-o", "--output-dir",
+                        help="where to write the .wav files (default: next to each PDF)")
+    parser.add_argument("-r", "--rate", type=int, default=DEFAULT_RATE,
+                        help="speech rate in words per minute (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes to use (default: %(default)s)")
+    parser.add_argument("--force", action="store_true",
+                        help="convert again even if the output is up to date")
+    return parser.parse_args(argv)
+
+
+def run_cli(argv):
+    args = parse_args(argv)
+    failed = run_batch(batch_jobs(args.inputs, args.output_dir), args.rate,
+                       max(1, args.workers), args.force)
+    return 1 if failed else 0
 
 
 def select_pdf():
@@ -17,9 +490,30 @@ def select_pdf():
     pdf_path_var.set(filepath)
 
 
-def update_progress(value):
-    progress_var.set(value)
-    root.update_idletasks()
+def report(value, status):
+    progress_queue.put(("progress", value, status))
+
+
+def conversion_worker(pdf_file, speed, workers, play_early):
+    """Runs on a background thread; talks to the UI only through progress_queue"""
+    global active_player
+    player = None
+    try:
+        if play_early:
+            player = active_player = SegmentPlayer()
+        completed = convert_pdf(pdf_file, audio_output_path, speed, workers,
+                                on_progress=report, cancel_event=cancel_event,
+                                on_segment=player.add if player else None)
+        progress_queue.put(("done",) if completed else ("cancelled",))
+
+    except Exception as e:
+        progress_queue.put(("error", str(e)))
+    finally:
+        if player:
+            if cancel_event.is_set():
+                player.stop()
+            else:
+                player.finish()
 
 
 def convert_pdf_to_audio():
@@ -29,42 +523,63 @@ def convert_pdf_to_audio():
         messagebox.showerror("Error", "Please select a PDF file first!")
         return
 
+    # Read the Tk variables here; the worker thread only sees plain values
     speed = int(speed_var.get())   # reading speed
+    workers = max(1, int(tts_workers_var.get()))
+
+    if active_player:
+        active_player.stop()
+    cancel_event.clear()
+    convert_button.config(state="disabled")
+    cancel_button.config(state="normal")
+    play_button.config(state="disabled")
+    save_button.config(state="disabled")
+    progress_var.set(0)
+    status_var.set("Starting...")
+
+    threading.Thread(target=conversion_worker,
+                     args=(pdf_file, speed, workers, play_early_var.get()),
+                     daemon=True).start()
+    root.after(POLL_INTERVAL_MS, poll_progress)
+
+
+def cancel_conversion():
+    cancel_event.set()
+    status_var.set("Cancelling...")
+    cancel_button.config(state="disabled")
+
+
+def poll_progress():
+    while True:
+        try:
+            message = progress_queue.get_nowait()
+        except queue.Empty:
+            break
+
+        kind = message[0]
+        if kind == "progress":
+            progress_var.set(message[1])
+            status_var.set(message[2])
+            continue
+
+        convert_button.config(state="normal")
+        cancel_button.config(state="disabled")
+        if kind == "done":
+            progress_var.set(100)
+            status_var.set("Done")
+            play_button.config(state="normal")
+            save_button.config(state="normal")
+            messagebox.showinfo("Success", "Audio generated successfully!")
+        elif kind == "cancelled":
+            progress_var.set(0)
+            status_var.set("Cancelled")
+        else:
+            progress_var.set(0)
+            status_var.set("Failed")
+            messagebox.showerror("Error", message[1])
+        return
 
-    try:
-        with open(pdf_file, 'rb') as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-
-            extracted_text = ""
-            total_pages = len(pdf_reader.pages)
-
-            for i, page in enumerate(pdf_reader.pages):
-                extracted_text += page.extract_text()
-                update_progress(int((i + 1) / total_pages * 50))
-                time.sleep(0.02)
-
-        if extracted_text.strip() == "":
-            messagebox.showerror("Error", "No readable text found!")
-            return
-
-        update_progress(60)
-
-        # Convert text to speech using pyttsx3
-        engine = pyttsx3.init()
-        engine.setProperty("rate", speed)  # set speed
-        engine.save_to_file(extracted_text, audio_output_path)
-        engine.runAndWait()
-
-        update_progress(100)
-
-        play_button.config(state="normal")
-        save_button.config(state="normal")
-
-        messagebox.showinfo("Success", "Audio generated successfully!")
-
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
-        update_progress(0)
+    root.after(POLL_INTERVAL_MS, poll_progress)
 
 
 def play_audio():
@@ -90,44 +605,71 @@ def save_audio():
 
 # -------- GUI ----------
 
-root = tk.Tk()
-root.title("PDF to Audio Converter (Offline)")
-root.geometry("480x420")
-
-pdf_path_var = tk.StringVar()
-progress_var = tk.IntVar()
-speed_var = tk.IntVar(value=150)  # default rate
-
-tk.Label(root, text="Select PDF File:", font=("Arial", 12)).pack(pady=10)
-tk.Entry(root, textvariable=pdf_path_var, width=43).pack()
-tk.Button(root, text="Browse", command=select_pdf).pack(pady=5)
-
-tk.Button(root, text="Convert to Audio", bg="#4CAF50", fg="white",
-          command=convert_pdf_to_audio).pack(pady=10)
-
-# Speed control
-tk.Label(root, text="Reading Speed (50 - 200):", font=("Arial", 12)).pack()
-speed_slider = tk.Scale(root, from_=50, to=200,
-                        orient="horizontal",
-                        variable=speed_var,
-                        length=250)
-speed_slider.pack(pady=10)
-
-# Progress bar
-tk.Label(root, text="Progress:", font=("Arial", 12)).pack()
-progress_bar = ttk.Progressbar(root, maximum=100,
-                               variable=progress_var,
-                               length=300)
-progress_bar.pack(pady=10)
-
-play_button = tk.Button(root, text="Play Audio",
-                        state="disabled",
-                        command=lambda: os.system(f'start {audio_output_path}'))
-play_button.pack(pady=10)
-
-save_button = tk.Button(root, text="Save Audio",
-                        state="disabled",
-                        command=save_audio)
-save_button.pack(pady=5)
-
-root.mainloop()
+# Guarded so worker processes can import this module without opening a window
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+    if tk is None:
+        sys.exit("tkinter is not available; pass PDF files to use the command line instead")
+
+    root = tk.Tk()
+    root.title("PDF to Audio Converter (Offline)")
+    root.geometry("480x520")
+
+    pdf_path_var = tk.StringVar()
+    progress_var = tk.IntVar()
+    speed_var = tk.IntVar(value=DEFAULT_RATE)  # default rate
+    play_early_var = tk.BooleanVar(value=True)
+    status_var = tk.StringVar(value="Idle")
+    tts_workers_var = tk.IntVar(value=os.cpu_count() or 1)
+
+    tk.Label(root, text="Select PDF File:", font=("Arial", 12)).pack(pady=10)
+    tk.Entry(root, textvariable=pdf_path_var, width=43).pack()
+    tk.Button(root, text="Browse", command=select_pdf).pack(pady=5)
+
+    buttons_frame = tk.Frame(root)
+    buttons_frame.pack(pady=10)
+    convert_button = tk.Button(buttons_frame, text="Convert to Audio", bg="#4CAF50", fg="white",
+                               command=convert_pdf_to_audio)
+    convert_button.pack(side="left", padx=5)
+    cancel_button = tk.Button(buttons_frame, text="Cancel", state="disabled",
+                              command=cancel_conversion)
+    cancel_button.pack(side="left", padx=5)
+
+    # Speed control
+    tk.Label(root, text="Reading Speed (50 - 200):", font=("Arial", 12)).pack()
+    speed_slider = tk.Scale(root, from_=50, to=200,
+                            orient="horizontal",
+                            variable=speed_var,
+                            length=250)
+    speed_slider.pack(pady=10)
+
+    # Parallel synthesis
+    workers_frame = tk.Frame(root)
+    workers_frame.pack(pady=5)
+    tk.Label(workers_frame, text="Worker processes:", font=("Arial", 12)).pack(side="left")
+    ttk.Spinbox(workers_frame, from_=1, to=os.cpu_count() or 1, width=5,
+                textvariable=tts_workers_var).pack(side="left", padx=5)
+
+    tk.Checkbutton(root, text="Start playback while converting",
+                   variable=play_early_var).pack()
+
+    # Progress bar
+    tk.Label(root, text="Progress:", font=("Arial", 12)).pack()
+    progress_bar = ttk.Progressbar(root, maximum=100,
+                                   variable=progress_var,
+                                   length=300)
+    progress_bar.pack(pady=(10, 0))
+    tk.Label(root, textvariable=status_var).pack(pady=(0, 10))
+
+    play_button = tk.Button(root, text="Play Audio",
+                            state="disabled",
+                            command=lambda: os.system(f'start {audio_output_path}'))
+    play_button.pack(pady=10)
+
+    save_button = tk.Button(root, text="Save Audio",
+                            state="disabled",
+                            command=save_audio)
+    save_button.pack(pady=5)
+
+    root.mainloop()
@@ -1,8 +1,29 @@
-from flask import Flask, render_template, request, redirect, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, session, flash, jsonify, g
 import sqlite3
+import queue
 from werkzeug.security import generate_password_hash, check_password_hash
 import re
-from datetime import datetime
+import sys
+import logging
+import itertools
+import os
+import socket
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from http.client import HTTPConnection
+from time import monotonic, perf_counter, sleep
+from urllib.parse import urlencode
+from werkzeug.serving import make_server
+
+try:
+    from asgiref.sync import sync_to_async
+    from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+except ImportError:  # only needed to serve over ASGI (pip install -r requirements.txt)
+    WsgiToAsgi = None
 
 app = Flask(__name__)
 app.secret_key = "cafe_secret_key_2024"
@@ -16,37 +37,170 @@ TIME_SLOTS = ["10:00-12:00", "12:00-14:00", "14:00-16:00", "16:00-18:00"]
 
 # ---------------- DATABASE ---------------- #
 
-def get_db():
-    conn = sqlite3.connect("database.db")
+DATABASE = "database.db"
+DB_POOL_SIZE = 16            # idle connections kept for reuse across requests
+DB_BUSY_TIMEOUT = 5.0        # seconds to wait for a lock before "database is locked"
+DB_STATEMENT_CACHE = 256     # prepared statements kept per connection
+
+connection_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+def connect_db():
+    """Open a tuned connection (pooled connections keep their prepared statements warm)"""
+    conn = sqlite3.connect(
+        DATABASE,
+        timeout=DB_BUSY_TIMEOUT,
+        cached_statements=DB_STATEMENT_CACHE,
+        check_same_thread=False  # handed between threads by the pool, one context at a time
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous = NORMAL")  # durable enough with WAL, far fewer fsyncs
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -8000")    # 8 MB page cache
     return conn
 
+def borrow_connection():
+    try:
+        return connection_pool.get_nowait()
+    except queue.Empty:
+        return connect_db()
+
+def return_connection(conn):
+    if conn.in_transaction:
+        conn.rollback()  # never hand unfinished work to the next borrower
+    try:
+        connection_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+def get_db():
+    """Connection for the current app context, borrowed from the pool"""
+    if "db" not in g:
+        g.db = borrow_connection()
+    return g.db
+
+@app.teardown_appcontext
+def release_db(exception):
+    conn = g.pop("db", None)
+    if conn is not None:
+        return_connection(conn)
+
+def drain_pool():
+    """Close idle pooled connections (e.g. after pointing DATABASE somewhere else)"""
+    while True:
+        try:
+            connection_pool.get_nowait().close()
+        except queue.Empty:
+            return
+
+def drop_duplicate_slots(conn):
+    """Keep only the earliest booking of each slot, so the unique slot index can be built"""
+    duplicates = conn.execute("""
+        SELECT id, user_id, table_number, date, time_slot FROM bookings
+        WHERE table_number IS NOT NULL AND date IS NOT NULL AND time_slot IS NOT NULL
+          AND id NOT IN (SELECT MIN(id) FROM bookings GROUP BY date, table_number, time_slot)
+    """).fetchall()
+    for row in duplicates:
+        app.logger.warning(
+            "Removing booking #%s of user %s: table %s on %s %s was booked earlier by someone else",
+            row["id"], row["user_id"], row["table_number"], row["date"], row["time_slot"])
+    conn.executemany("DELETE FROM bookings WHERE id = ?", [(row["id"],) for row in duplicates])
+
+def add_booking_created_at(conn):
+    """Databases created before migrations existed have no bookings.created_at"""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(bookings)")}
+    if "created_at" not in columns:
+        conn.execute("ALTER TABLE bookings ADD COLUMN created_at TIMESTAMP")
+
+# Each migration takes the schema from version N to N + 1 (tracked in PRAGMA user_version)
+# and is a list of SQL statements or functions taking the connection.
+# Append new ones; never edit a migration that has already shipped.
+MIGRATIONS = [
+    # 1: base tables (IF NOT EXISTS adopts databases created before migrations existed)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS bookings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            table_number INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            time_slot TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            UNIQUE(table_number, date, time_slot)
+        )
+        """,
+    ],
+    # 2: create_booking()'s ON CONFLICT needs a unique index on the slot, which databases
+    # created before bookings had its UNIQUE constraint lack (and so may hold double
+    # bookings). Date first, so the booking page and availability can also scan date
+    # ranges from it.
+    [
+        drop_duplicate_slots,
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_bookings_date_table "
+        "ON bookings (date, table_number, time_slot)",
+    ],
+    # 3: my-bookings filters by user, sorts by date DESC, time_slot and reads the rest of
+    # the row from the index too (id is the rowid, which every index carries)
+    [
+        add_booking_created_at,
+        "CREATE INDEX IF NOT EXISTS idx_bookings_user_date "
+        "ON bookings (user_id, date DESC, time_slot, table_number, created_at)",
+    ],
+]
+
+def migrate(conn):
+    """Apply pending migrations one transaction at a time; returns the schema version"""
+    while True:
+        # IMMEDIATE so that workers starting together apply each migration only once
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= len(MIGRATIONS):
+                conn.rollback()
+                return version
+            for step in MIGRATIONS[version]:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
 def init_db():
-    with get_db() as conn:
-        # Users table with unique email constraint
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Bookings table with foreign key constraint
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS bookings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                table_number INTEGER NOT NULL,
-                date TEXT NOT NULL,
-                time_slot TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                UNIQUE(table_number, date, time_slot)
-            )
-        """)
-        conn.commit()
+    conn = connect_db()
+    # WAL lets readers run alongside the single writer; the setting persists in the file
+    conn.execute("PRAGMA journal_mode = WAL")
+    migrate(conn)
+    conn.close()
+
+# Hot queries, shared by the routes and check_query_plans()
+UPCOMING_BOOKINGS_SQL = """
+    SELECT table_number, date, time_slot FROM bookings
+    WHERE date >= ?
+"""
+BOOKED_IN_RANGE_SQL = """
+    SELECT date, table_number, time_slot FROM bookings
+    WHERE date BETWEEN ? AND ?
+"""
+USER_BOOKINGS_SQL = """
+    SELECT id, table_number, date, time_slot, created_at FROM bookings
+    WHERE user_id = ?
+    ORDER BY date DESC, time_slot ASC
+"""
+USER_BOOKING_SQL = "SELECT * FROM bookings WHERE id = ? AND user_id = ?"
+USER_BY_EMAIL_SQL = "SELECT * FROM users WHERE email = ?"
 
 # Initialize database
 init_db()
@@ -80,6 +234,164 @@ def get_today_date():
     """Get today's date in YYYY-MM-DD format"""
     return datetime.now().strftime("%Y-%m-%d")
 
+def parse_date(value):
+    """Parse a YYYY-MM-DD string, returning None if it is not a valid date"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+# ---------------- AVAILABILITY ---------------- #
+
+# Per-date grids, invalidated by book()/cancel(). The TTL bounds staleness when several
+# worker processes each keep their own cache.
+AVAILABILITY_TTL = 60
+AVAILABILITY_CACHE_SIZE = 512  # dates kept at most
+MAX_RANGE_DAYS = 31
+
+# date -> (expires_at, grid), oldest write first; every entry gets the same TTL,
+# so this is also expiry order
+availability_cache = OrderedDict()
+availability_version = 0
+availability_lock = threading.Lock()
+
+def build_grid(booked):
+    """Availability grid for one date from its set of booked (table, time slot) pairs"""
+    return [
+        {
+            "table": table,
+            "time": time,
+            "available": (table, time) not in booked,
+            "status": "Available" if (table, time) not in booked else "Booked"
+        }
+        for table in TABLES
+        for time in TIME_SLOTS
+    ]
+
+def load_booked(conn, start, end):
+    """Booked (table, time slot) pairs per date between start and end, in one query"""
+    booked = defaultdict(set)
+    rows = conn.execute(BOOKED_IN_RANGE_SQL, (start, end))
+    for row in rows:
+        booked[row["date"]].add((row["table_number"], row["time_slot"]))
+    return booked
+
+def get_availability(conn, dates):
+    """Availability grids for a list of YYYY-MM-DD dates, served from the cache when fresh"""
+    global availability_version
+    now = monotonic()
+    grids = {}
+    with availability_lock:
+        version = availability_version
+        for date in dates:
+            entry = availability_cache.get(date)
+            if entry and entry[0] > now:
+                grids[date] = entry[1]
+
+    missing = [date for date in dates if date not in grids]
+    if missing:
+        booked = load_booked(conn, min(missing), max(missing))
+        fresh = {date: build_grid(booked.get(date, ())) for date in missing}
+        with availability_lock:
+            # Skip caching if a booking changed while we were reading
+            if version == availability_version:
+                for date, grid in fresh.items():
+                    availability_cache[date] = (now + AVAILABILITY_TTL, grid)
+                    availability_cache.move_to_end(date)
+                purge_availability(now)
+        grids.update(fresh)
+
+    return [grids[date] for date in dates]
+
+def purge_availability(now):
+    """Evict expired grids, then the oldest beyond the size cap (call with the lock held)"""
+    while availability_cache:
+        expires_at, _ = next(iter(availability_cache.values()))
+        if expires_at > now and len(availability_cache) <= AVAILABILITY_CACHE_SIZE:
+            return
+        availability_cache.popitem(last=False)
+
+def invalidate_availability(date):
+    """Drop the cached grid for a date after a booking is created or cancelled"""
+    global availability_version
+    with availability_lock:
+        availability_cache.pop(date, None)
+        availability_version += 1
+
+# ---------------- BOOKINGS ---------------- #
+
+def validate_booking(table, date, time):
+    """Check a requested booking; returns (table, date, time) or raises ValueError with the reason"""
+    # Forms send digit strings; JSON must send a whole number (int() would turn 2.7 into 2
+    # and true into 1)
+    if isinstance(table, str) and table.isdecimal():
+        table = int(table)
+    if isinstance(table, bool) or not isinstance(table, int):
+        raise ValueError("Invalid input data")
+    
+    selected_date = parse_date(date)
+    if selected_date is None or table not in TABLES or time not in TIME_SLOTS:
+        raise ValueError("Invalid input data")
+    
+    if selected_date < datetime.now().date():
+        raise ValueError("Cannot book tables for past dates")
+    
+    # Canonical form, so "2030-1-5" and "2030-01-05" are the same slot
+    return table, selected_date.isoformat(), time
+
+def booking_json(row):
+    return {
+        "id": row["id"],
+        "table": row["table_number"],
+        "date": row["date"],
+        "time": row["time_slot"]
+    }
+
+def list_bookings(conn, user_id):
+    return conn.execute(USER_BOOKINGS_SQL, (user_id,)).fetchall()
+
+def create_booking(conn, user_id, table, date, time):
+    """Book a slot in one atomic statement; returns the booking id, or None if already taken"""
+    # IMMEDIATE takes the write lock up front, so contending writers wait in the busy
+    # handler instead of failing on a lock upgrade
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cursor = conn.execute("""
+            INSERT INTO bookings (user_id, table_number, date, time_slot, created_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_number, date, time_slot) DO NOTHING
+        """, (user_id, table, date, time))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    
+    if cursor.rowcount != 1:
+        return None
+    invalidate_availability(date)
+    return cursor.lastrowid
+
+def cancel_booking(conn, user_id, booking_id):
+    """Delete one of a user's bookings; returns its date, or None if it is not theirs"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Verify ownership before deleting
+        booking = conn.execute(USER_BOOKING_SQL, (booking_id, user_id)).fetchone()
+        if booking:
+            conn.execute(
+                "DELETE FROM bookings WHERE id = ? AND user_id = ?",
+                (booking_id, user_id)
+            )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    
+    if not booking:
+        return None
+    invalidate_availability(booking["date"])
+    return booking["date"]
+
 # ---------------- ROUTES ---------------- #
 
 @app.route("/")
@@ -152,9 +464,7 @@ def login():
         password = request.form["password"]
         
         conn = get_db()
-        user = conn.execute(
-            "SELECT * FROM users WHERE email = ?", (email,)
-        ).fetchone()
+        user = conn.execute(USER_BY_EMAIL_SQL, (email,)).fetchone()
         
         if user and check_password_hash(user["password"], password):
             session["user_id"] = user["id"]
@@ -178,48 +488,25 @@ def book():
     
     if request.method == "POST":
         try:
-            table = int(request.form["table"])
-            date = request.form["date"]
-            time = request.form["time"]
-            
-            # Validate date is not in the past
-            selected_date = datetime.strptime(date, "%Y-%m-%d").date()
-            current_date = datetime.now().date()
-            
-            if selected_date < current_date:
-                flash("Cannot book tables for past dates", "danger")
-                return redirect("/book")
-            
-            # Check availability
-            exists = conn.execute("""
-                SELECT * FROM bookings 
-                WHERE table_number = ? AND date = ? AND time_slot = ?
-            """, (table, date, time)).fetchone()
+            table, date, time = validate_booking(
+                request.form.get("table"), request.form.get("date"), request.form.get("time")
+            )
             
-            if exists:
+            # Create the booking unless the slot is already taken
+            if create_booking(conn, session["user_id"], table, date, time) is None:
                 flash(f"Table {table} is already booked for {date} at {time}", "warning")
                 return redirect("/book")
             
-            # Create booking
-            conn.execute("""
-                INSERT INTO bookings (user_id, table_number, date, time_slot)
-                VALUES (?, ?, ?, ?)
-            """, (session["user_id"], table, date, time))
-            conn.commit()
-            
             flash(f"Table {table} booked successfully for {date} at {time}!", "success")
             return redirect("/my-bookings")
             
-        except ValueError:
-            flash("Invalid input data", "danger")
+        except ValueError as e:
+            flash(str(e), "danger")
         except Exception as e:
             flash(f"Error: {str(e)}", "danger")
     
     # Get all bookings for current date to show availability
-    bookings = conn.execute("""
-        SELECT table_number, date, time_slot FROM bookings 
-        WHERE date >= ?
-    """, (today,)).fetchall()
+    bookings = conn.execute(UPCOMING_BOOKINGS_SQL, (today,)).fetchall()
     
     return render_template(
         "book.html",
@@ -238,11 +525,7 @@ def my_bookings():
         return redirect("/login")
     
     conn = get_db()
-    bookings = conn.execute("""
-        SELECT * FROM bookings 
-        WHERE user_id = ? 
-        ORDER BY date DESC, time_slot ASC
-    """, (session["user_id"],)).fetchall()
+    bookings = list_bookings(conn, session["user_id"])
     
     today = get_today_date()
     return render_template("my_bookings.html", bookings=bookings, page="my-bookings", today=today)
@@ -256,22 +539,10 @@ def cancel(booking_id):
     
     conn = get_db()
     
-    # Verify ownership before deleting
-    booking = conn.execute(
-        "SELECT * FROM bookings WHERE id = ? AND user_id = ?",
-        (booking_id, session["user_id"])
-    ).fetchone()
-    
-    if not booking:
+    if cancel_booking(conn, session["user_id"], booking_id) is None:
         flash("Booking not found or you don't have permission", "danger")
         return redirect("/my-bookings")
     
-    conn.execute(
-        "DELETE FROM bookings WHERE id = ? AND user_id = ?",
-        (booking_id, session["user_id"])
-    )
-    conn.commit()
-    
     flash("Booking cancelled successfully", "success")
     return redirect("/my-bookings")
 
@@ -288,37 +559,378 @@ def api_availability():
     date = request.args.get("date")
     if not date:
         return jsonify({"error": "Date parameter required"}), 400
+    selected_date = parse_date(date)
+    if selected_date is None:
+        return jsonify({"error": "Date must be in YYYY-MM-DD format"}), 400
+    date = selected_date.isoformat()  # one cache entry per day, however it was written
     
-    conn = get_db()
-    data = []
-    
-    for table in TABLES:
-        for time in TIME_SLOTS:
-            booked = conn.execute("""
-                SELECT * FROM bookings 
-                WHERE table_number = ? AND date = ? AND time_slot = ?
-            """, (table, date, time)).fetchone()
-            
-            data.append({
-                "table": table,
-                "time": time,
-                "available": booked is None,
-                "status": "Available" if booked is None else "Booked"
-            })
+    data = get_availability(get_db(), [date])[0]
     
     return jsonify({"date": date, "availability": data})
 
+@app.route("/api/availability/week")
+def api_availability_week():
+    start = parse_date(request.args.get("start", get_today_date()))
+    if start is None:
+        return jsonify({"error": "Start must be in YYYY-MM-DD format"}), 400
+    
+    try:
+        days = int(request.args.get("days", 7))
+    except ValueError:
+        return jsonify({"error": "Days must be a number"}), 400
+    if not 1 <= days <= MAX_RANGE_DAYS:
+        return jsonify({"error": f"Days must be between 1 and {MAX_RANGE_DAYS}"}), 400
+    
+    dates = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    grids = get_availability(get_db(), dates)
+    
+    return jsonify({
+        "start": dates[0],
+        "end": dates[-1],
+        "days": [{"date": date, "availability": grid} for date, grid in zip(dates, grids)]
+    })
+
+@app.route("/api/bookings", methods=["GET"])
+def api_list_bookings():
+    if "user_id" not in session:
+        return jsonify({"error": "Login required"}), 401
+    
+    rows = list_bookings(get_db(), session["user_id"])
+    
+    return jsonify({"bookings": [booking_json(row) for row in rows]})
+
+@app.route("/api/bookings", methods=["POST"])
+def api_create_booking():
+    if "user_id" not in session:
+        return jsonify({"error": "Login required"}), 401
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    try:
+        table, date, time = validate_booking(data.get("table"), data.get("date"), data.get("time"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    booking_id = create_booking(get_db(), session["user_id"], table, date, time)
+    if booking_id is None:
+        return jsonify({"error": f"Table {table} is already booked for {date} at {time}"}), 409
+    
+    return jsonify({"booking": {"id": booking_id, "table": table, "date": date, "time": time}}), 201
+
+@app.route("/api/bookings/<int:booking_id>", methods=["DELETE"])
+def api_cancel_booking(booking_id):
+    if "user_id" not in session:
+        return jsonify({"error": "Login required"}), 401
+    
+    if cancel_booking(get_db(), session["user_id"], booking_id) is None:
+        return jsonify({"error": "Booking not found or you don't have permission"}), 404
+    
+    return jsonify({"cancelled": booking_id})
+
+# ---------------- ASGI ---------------- #
+
+# `uvicorn app:asgi_app` serves the app from an event loop. Each request, and with it all of
+# its database work, runs on this bounded pool, so slow disk I/O never blocks the loop and
+# at most ASGI_WORKERS requests hold a database connection at once.
+ASGI_WORKERS = 8
+request_executor = ThreadPoolExecutor(max_workers=ASGI_WORKERS, thread_name_prefix="asgi")
+
+if WsgiToAsgi is not None:
+    class PooledWsgiToAsgiInstance(WsgiToAsgiInstance):
+        # asgiref runs WSGI apps thread-sensitively, i.e. every request on one shared thread
+        run_wsgi_app = sync_to_async(WsgiToAsgiInstance.__dict__["run_wsgi_app"].func,
+                                     thread_sensitive=False, executor=request_executor)
+
+    class PooledWsgiToAsgi(WsgiToAsgi):
+        async def __call__(self, scope, receive, send):
+            await PooledWsgiToAsgiInstance(self.wsgi_application, self.duplicate_header_limit)(
+                scope, receive, send)
+
+    asgi_app = PooledWsgiToAsgi(app)
+else:
+    asgi_app = None
+
 # ---------------- ERROR HANDLERS ---------------- #
 @app.errorhandler(404)
 def page_not_found(e):
+    if request.path.startswith("/api/"):
+        return jsonify({"error": "Not found"}), 404
     flash("Page not found", "warning")
     return redirect("/book")
 
 @app.errorhandler(500)
 def server_error(e):
+    if request.path.startswith("/api/"):
+        return jsonify({"error": "Server error occurred"}), 500
     flash("Server error occurred", "danger")
     return redirect("/book")
 
+# ---------------- QUERY PLAN CHECKS ---------------- #
+
+# Hot query -> what its plan must use; any full scan or temp sort also fails the check
+QUERY_PLAN_EXPECTATIONS = [
+    ("upcoming bookings", UPCOMING_BOOKINGS_SQL, ("2024-01-01",),
+     "USING COVERING INDEX idx_bookings_date_table"),
+    ("availability range", BOOKED_IN_RANGE_SQL, ("2024-01-01", "2024-01-07"),
+     "USING COVERING INDEX idx_bookings_date_table"),
+    ("my bookings", USER_BOOKINGS_SQL, (1,), "USING COVERING INDEX idx_bookings_user_date"),
+    ("booking ownership", USER_BOOKING_SQL, (1, 1), "USING INTEGER PRIMARY KEY"),
+    ("login", USER_BY_EMAIL_SQL, ("guest@example.com",), "USING INDEX sqlite_autoindex_users_1"),
+]
+
+@contextmanager
+def scratch_database():
+    """Point the app at a freshly migrated temporary database for the duration"""
+    global DATABASE
+    original_database = DATABASE
+    with tempfile.TemporaryDirectory() as tmp:
+        DATABASE = os.path.join(tmp, "scratch.db")
+        drain_pool()
+        try:
+            init_db()
+            yield DATABASE
+        finally:
+            drain_pool()
+            DATABASE = original_database
+
+def explain(conn, sql, params):
+    return [row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+def check_query_plans(conn):
+    """Return (name, plan) for every hot query whose plan misses its index or scans/sorts"""
+    failures = []
+    for name, sql, params, expected in QUERY_PLAN_EXPECTATIONS:
+        plan = explain(conn, sql, params)
+        uses_index = any(expected in step for step in plan)
+        scans = any(step.startswith("SCAN") or "TEMP B-TREE" in step for step in plan)
+        if not uses_index or scans:
+            failures.append((name, plan))
+    return failures
+
+def run_plan_checks():
+    """Check the hot queries against the current migrations; returns True if all pass"""
+    with scratch_database():
+        conn = connect_db()
+        failures = check_query_plans(conn)
+        conn.close()
+    
+    for name, sql, params, expected in QUERY_PLAN_EXPECTATIONS:
+        print(f"{'FAIL' if any(name == failed for failed, _ in failures) else 'ok  '} {name}")
+    for name, plan in failures:
+        print(f"\n{name} plan:\n  " + "\n  ".join(plan))
+    return not failures
+
+# ---------------- LOAD TEST ---------------- #
+
+def load_test(clients=32, days=1):
+    """Have every client race for every slot on a temporary database, then check the result"""
+    with scratch_database():
+        conn = connect_db()
+        with conn:
+            user_ids = [
+                conn.execute(
+                    "INSERT INTO users (email, password) VALUES (?, ?)",
+                    (f"load{i}@example.com", "x")
+                ).lastrowid
+                for i in range(clients)
+            ]
+        
+        start = datetime.now().date() + timedelta(days=1)
+        slots = [
+            ((start + timedelta(days=d)).strftime("%Y-%m-%d"), table, time)
+            for d in range(days) for table in TABLES for time in TIME_SLOTS
+        ]
+        outcomes = defaultdict(int)
+        latencies = []
+        lock = threading.Lock()
+        
+        def run_client(user_id):
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess["user_id"] = user_id
+            for date, table, time in slots:
+                began = perf_counter()
+                response = client.post("/book", data={"table": table, "date": date, "time": time})
+                elapsed = perf_counter() - began
+                location = response.headers.get("Location", "")
+                outcome = ("booked" if location.endswith("/my-bookings")
+                           else "already booked" if location.endswith("/book") else "error")
+                with lock:
+                    outcomes[outcome] += 1
+                    latencies.append(elapsed)
+        
+        threads = [threading.Thread(target=run_client, args=(user_id,)) for user_id in user_ids]
+        began = perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = perf_counter() - began
+        
+        rows = conn.execute("""
+            SELECT COUNT(*) AS bookings, COUNT(DISTINCT table_number || date || time_slot) AS slots
+            FROM bookings
+        """).fetchone()
+        conn.close()
+    
+    latencies.sort()
+    requests_made = len(latencies)
+    print(f"{clients} clients x {len(slots)} contended slots = {requests_made} booking requests")
+    print(f"throughput: {requests_made / elapsed:.0f} req/s, "
+          f"p50 {latencies[requests_made // 2] * 1000:.1f} ms, "
+          f"p95 {latencies[int(requests_made * 0.95)] * 1000:.1f} ms")
+    print("outcomes: " + ", ".join(f"{name} {count}" for name, count in sorted(outcomes.items())))
+    
+    correct = (outcomes["booked"] == len(slots) == rows["bookings"] == rows["slots"]
+               and outcomes["error"] == 0)
+    print("correct: exactly one booking per slot" if correct else "INCORRECT: see counts above")
+    return correct
+
+# ---------------- API BENCHMARK ---------------- #
+
+@contextmanager
+def running_server(asgi=False):
+    """Serve the app on a free local port from a background thread; yields the port"""
+    if not asgi:
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            yield server.server_port
+        finally:
+            server.shutdown()
+        return
+    
+    import uvicorn
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(asgi_app, log_level="error", lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started and thread.is_alive():
+        sleep(0.01)
+    try:
+        yield sock.getsockname()[1]
+    finally:
+        server.should_exit = True
+        thread.join()
+        sock.close()
+
+def benchmark_api(clients=16, requests_per_client=50):
+    """Compare the form routes with the JSON API over HTTP on a scratch database,
+    served by the threaded WSGI server and over ASGI"""
+    servers = [("wsgi", False)]
+    try:
+        import uvicorn  # noqa: F401
+        servers.append(("asgi", True))
+    except ImportError:
+        print("uvicorn is not installed; benchmarking the WSGI server only")
+    
+    with scratch_database():
+        conn = connect_db()
+        with conn:
+            conn.execute(
+                "INSERT INTO users (email, password) VALUES (?, ?)",
+                ("bench@example.com", generate_password_hash("Bench-pass1"))
+            )
+        
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no per-request log lines
+        
+        # Every booking request gets its own free slot; 20 slots per day from tomorrow on
+        slot_numbers = itertools.count()
+        first_day = datetime.now().date() + timedelta(days=1)
+        def next_slot():
+            n = next(slot_numbers)
+            date = (first_day + timedelta(days=n // 20)).strftime("%Y-%m-%d")
+            return TABLES[n % 5], date, TIME_SLOTS[(n // 5) % 4]
+        
+        def run_suite(port):
+            def send(method, path, body=None, headers={}):
+                http = HTTPConnection("127.0.0.1", port)
+                try:
+                    http.request(method, path, body, headers)
+                    response = http.getresponse()
+                    response.read()
+                    return response
+                finally:
+                    http.close()
+            
+            login = send("POST", "/login",
+                         urlencode({"email": "bench@example.com", "password": "Bench-pass1"}),
+                         {"Content-Type": "application/x-www-form-urlencoded"})
+            cookie = login.getheader("Set-Cookie").split(";")[0]
+            form_headers = {"Content-Type": "application/x-www-form-urlencoded", "Cookie": cookie}
+            json_headers = {"Content-Type": "application/json", "Cookie": cookie}
+            
+            def sync_book():
+                table, date, time = next_slot()
+                body = urlencode({"table": table, "date": date, "time": time})
+                return send("POST", "/book", body, form_headers), 302
+            
+            def api_book():
+                table, date, time = next_slot()
+                body = '{"table": %d, "date": "%s", "time": "%s"}' % (table, date, time)
+                return send("POST", "/api/bookings", body, json_headers), 201
+            
+            def run(request_fn):
+                latencies, errors = [], []
+                def client():
+                    for _ in range(requests_per_client):
+                        began = perf_counter()
+                        response, expected = request_fn()
+                        latencies.append(perf_counter() - began)
+                        if response.status != expected:
+                            errors.append(response.status)
+                threads = [threading.Thread(target=client) for _ in range(clients)]
+                began = perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = perf_counter() - began
+                latencies.sort()
+                return (len(latencies) / elapsed, latencies[len(latencies) // 2] * 1000,
+                        latencies[int(len(latencies) * 0.95)] * 1000, len(errors))
+            
+            results = [
+                ("book", "POST /book", run(sync_book)),
+                ("book", "POST /api/bookings", run(api_book)),
+                ("list bookings", "GET /my-bookings",
+                 run(lambda: (send("GET", "/my-bookings", headers=form_headers), 200))),
+                ("list bookings", "GET /api/bookings",
+                 run(lambda: (send("GET", "/api/bookings", headers=json_headers), 200))),
+            ]
+            
+            # Cancel the bookings made above, half through each path
+            booking_ids = iter([row["id"] for row in conn.execute("SELECT id FROM bookings")])
+            results += [
+                ("cancel", "GET /cancel/<id>",
+                 run(lambda: (send("GET", f"/cancel/{next(booking_ids)}", headers=form_headers), 302))),
+                ("cancel", "DELETE /api/bookings/<id>",
+                 run(lambda: (send("DELETE", f"/api/bookings/{next(booking_ids)}", headers=json_headers), 200))),
+            ]
+            return results
+        
+        results = []
+        for server, asgi in servers:
+            with running_server(asgi) as port:
+                results += [(server, *row) for row in run_suite(port)]
+        conn.close()
+    
+    print(f"{clients} clients x {requests_per_client} requests per route")
+    print(f"{'server':<8}{'operation':<15}{'route':<28}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+    for server, operation, route, (throughput, p50, p95, errors) in results:
+        print(f"{server:<8}{operation:<15}{route:<28}{throughput:>8.0f}{p50:>9.1f}{p95:>9.1f}{errors:>8}")
+    return all(errors == 0 for _, _, _, (_, _, _, errors) in results)
+
 # ---------------- MAIN ---------------- #
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["loadtest"]:
+        ok = load_test(*(int(arg) for arg in sys.argv[2:4]))
+        sys.exit(0 if ok else 1)
+    if sys.argv[1:] == ["check-plans"]:
+        sys.exit(0 if run_plan_checks() else 1)
+    if sys.argv[1:2] == ["benchmark"]:
+        ok = benchmark_api(*(int(arg) for arg in sys.argv[2:4]))
+        sys.exit(0 if ok else 1)
     app.run(debug=True)